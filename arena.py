@@ -0,0 +1,343 @@
+# arena.py
+# Viele Schlangen auf einem Brett. Alle entscheiden auf demselben Stand, danach werden die Züge gleichzeitig
+# aufgelöst:
+#   - Wand: Kopf außerhalb des Bretts
+#   - Körper: Kopf auf einem Feld, das zu Tickbeginn belegt war (auch Schwänze, wie bei einer Schlange allein)
+#   - Kopf an Kopf: mehrere Köpfe auf demselben Feld, alle sterben; so wird auch umkämpftes Futter entschieden
+# Kollisionen laufen über ein gemeinsames Belegungsraster und ein Dict der beanspruchten Felder, nie über
+# paarweise Vergleiche der Körper. Futter liegt in einem räumlichen Hash (Eimer zu BUCKET x BUCKET Feldern),
+# damit "nächstes Futter" nicht alle Futterfelder durchsucht. Tote Schlangen verschwinden und starten
+# (mit respawn) neu mit Länge 1.
+#
+# Strategien (POLICIES): "greedy" geht zum nächsten Futter und meidet Sackgassen; "auto" ist auto_move auf
+# einer Sicht der Schlange, in der die anderen Schlangen als feste Hindernisse gelten.
+#
+# Aufruf: python arena.py --cols 200 --rows 200 --snakes 300 --foods 300 --ticks 1000
+import argparse
+import csv
+import random
+import time
+from collections import deque
+from auto_move import auto_move
+from board import Board, zobrist_keys
+from core import SnakeCore, DecisionView
+from profiler import Histogram
+from tables import get_tables
+from transposition import DecisionCache
+
+BUCKET = 16
+LINEAR_FOODS = 32  # bis zu so vielen Futterfeldern ist ein Durchlauf billiger als die Eimersuche
+ARENA_SPEED = 1000  # Züge/s für auto_move; hält das Zeitbudget des Planers pro Schlange klein
+BLOCKED = 1 << 60  # Stempel fremder Felder: werden aus Sicht der Schlange nie frei
+
+
+class _Stamps(dict):
+    # Stempel nur der eigenen Segmente; fremde belegte Felder gelten für a_star und free_after als dauerhaft belegt
+    def __missing__(self, cell):
+        return BLOCKED
+
+
+class SharedBoard(Board):
+    # Board einer Arena-Schlange: eigener Körper, aber das Belegungsraster gehört der Arena.
+    # Ohne Frei-Index und ohne Stempel-Array pro Feld; Speicher wächst mit der Länge, nicht mit dem Brett.
+    def __init__(self, cols, rows, grid, segments=()):
+        self.cols = cols
+        self.rows = rows
+        self.body = deque()
+        self.grid = grid
+        self.stamp = _Stamps()
+        self.pushes = 0
+        self.keys = zobrist_keys(cols * rows)
+        self.zobrist = 0
+        for pos in reversed(segments):
+            self.push_head(pos)
+
+    def push_head(self, pos):
+        i = self.index(pos)
+        self.body.appendleft(pos)
+        self.grid[i] = 1
+        self.pushes += 1
+        self.stamp[i] = self.pushes
+        self.zobrist ^= self.keys[i]
+
+    def pop_tail(self):
+        pos = self.body.pop()
+        i = self.index(pos)
+        self.grid[i] = 0
+        del self.stamp[i]
+        self.zobrist ^= self.keys[i]
+        return pos
+
+
+class ArenaSnake(DecisionView):
+    # Sicht einer Schlange für die Strategien: ein DecisionView der Arena-Vorlage (Arena.template) mit eigenem
+    # Körper auf dem gemeinsamen Raster. Ausgeführt wird die Entscheidung von Arena.step() für alle gleichzeitig.
+    @classmethod
+    def create(cls, arena, ident, start):
+        # Ohne Cache: der Schlüssel erfasst nur den eigenen Körper, das Raster aber auch alle anderen Schlangen;
+        # ein gemerkter Pfad wäre nach deren Zügen veraltet
+        return arena.template.decision_view(cls, ident=ident, cache=DecisionCache(maxsize=0),
+                                            snake=SharedBoard(arena.cols, arena.rows, arena.grid, [start]))
+
+    def spawn_food(self):
+        # Futter verteilt die Arena; auto_move darf nach Fehlschlägen kein eigenes ziehen
+        return self.food
+
+
+class FoodIndex:
+    # Futterfelder als Menge plus Eimer im Raster; nearest() sucht ringweise um den Eimer des Kopfes
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.cells = set()
+        self.buckets = {}
+        self.max_ring = max(cols, rows) // BUCKET + 1
+
+    def _bucket(self, cell):
+        return (cell % self.cols // BUCKET, cell // self.cols // BUCKET)
+
+    def add(self, cell):
+        self.cells.add(cell)
+        self.buckets.setdefault(self._bucket(cell), set()).add(cell)
+
+    def remove(self, cell):
+        self.cells.discard(cell)
+        bucket = self._bucket(cell)
+        members = self.buckets[bucket]
+        members.discard(cell)
+        if not members:
+            del self.buckets[bucket]
+
+    def __contains__(self, cell):
+        return cell in self.cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def nearest(self, pos):
+        # Futterfeld mit kleinstem Manhattan-Abstand zu pos, oder None
+        x, y = pos
+        cols = self.cols
+        if len(self.cells) <= LINEAR_FOODS:
+            return min(self.cells, key=lambda c: abs(c % cols - x) + abs(c // cols - y), default=None)
+        bx, by = x // BUCKET, y // BUCKET
+        best, best_distance = None, None
+        for ring in range(self.max_ring + 1):
+            for bucket_x in range(bx - ring, bx + ring + 1):
+                edge = bucket_x in (bx - ring, bx + ring)
+                for bucket_y in (range(by - ring, by + ring + 1) if edge else (by - ring, by + ring)):
+                    for cell in self.buckets.get((bucket_x, bucket_y), ()):
+                        distance = abs(cell % cols - x) + abs(cell // cols - y)
+                        if best is None or distance < best_distance:
+                            best, best_distance = cell, distance
+            # Felder in Ring ring + 1 liegen mindestens ring * BUCKET + 1 entfernt
+            if best is not None and best_distance <= ring * BUCKET:
+                break
+        return best
+
+
+def greedy_policy(arena, snake):
+    # Zum nächsten Futter. Gemieden werden, in dieser Rangfolge: Sackgassen (kein freies Folgefeld) und
+    # Felder neben einem fremden Kopf, auf denen ein Kopf-an-Kopf-Zusammenstoß droht
+    grid, adjacency, cols, heads = arena.grid, arena.adjacency, arena.cols, arena.heads
+    head = snake.snake[0]
+    cell = head[1] * cols + head[0]
+    food = snake.food
+    best, best_key = None, None
+    for neighbor in adjacency[4 * cell:4 * cell + 4]:
+        if neighbor < 0 or grid[neighbor]:
+            continue
+        exits = 0
+        contested = False
+        for after in adjacency[4 * neighbor:4 * neighbor + 4]:
+            if after >= 0 and not grid[after]:
+                exits += 1
+            elif after != cell and after in heads:
+                contested = True
+        distance = abs(neighbor % cols - food[0]) + abs(neighbor // cols - food[1]) if food else 0
+        key = (exits == 0, contested, distance, arena.rng.random())
+        if best_key is None or key < best_key:
+            best, best_key = neighbor, key
+    return None if best is None else (best % cols, best // cols)
+
+
+def auto_policy(arena, snake):
+    if snake.food is None:
+        return greedy_policy(arena, snake)
+    snake.decision = snake.cause = None
+    auto_move(snake)
+    return snake.decision
+
+
+POLICIES = {"greedy": greedy_policy, "auto": auto_policy}
+
+
+class Arena:
+    def __init__(self, cols, rows, snakes, foods, policy="greedy", seed=None, respawn=True):
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.grid = bytearray(self.cells)
+        self.adjacency = get_tables(cols, rows).adjacency
+        self.rng = random.Random(seed)
+        self.policy = POLICIES[policy] if isinstance(policy, str) else policy
+        self.respawn = respawn
+        self.target_foods = foods
+        self.food = FoodIndex(cols, rows)
+        self.template = self.snake_template()
+        self.snakes = []
+        for ident in range(snakes):
+            start = self.random_free()
+            if start is None:
+                break
+            self.snakes.append(ArenaSnake.create(self, ident, start))
+        self.spawn_food()
+        self.ticks = 0
+        self.eaten = 0
+        self.deaths = {}
+        self.best_length = 1
+        self.tick_ns = Histogram()
+        self.heads = set()  # Kopffelder zu Tickbeginn, für die Strategien
+
+    def snake_template(self):
+        # Spielstand, von dem jede Schlange ihre Sicht erbt; einmal pro Arena
+        template = SnakeCore(0, auto_move, self.cols, self.rows)
+        template.seed = None
+        template.rng = self.rng
+        # Kein gemeinsamer Hamilton-Zyklus in der Arena: immer Futter jagen (Schritte 1 bis 3)
+        template.strategic_length = self.cells
+        template.cycle_ordered = False
+        template.base_speed = template.current_speed = ARENA_SPEED
+        template.food = None  # nächstes Futter, setzt die Arena vor jeder Entscheidung
+        return template
+
+    def random_free(self):
+        # Freies Feld als (Spalte, Zeile): erst Zufallsfelder mit Verwerfen, auf vollem Brett ein Durchlauf
+        grid, cells = self.grid, self.cells
+        for _ in range(32):
+            cell = self.rng.randrange(cells)
+            if not grid[cell] and cell not in self.food:
+                return (cell % self.cols, cell // self.cols)
+        free = [cell for cell in range(cells) if not grid[cell] and cell not in self.food]
+        if not free:
+            return None
+        cell = free[self.rng.randrange(len(free))]
+        return (cell % self.cols, cell // self.cols)
+
+    def spawn_food(self):
+        while len(self.food) < self.target_foods:
+            pos = self.random_free()
+            if pos is None:
+                return
+            self.food.add(pos[1] * self.cols + pos[0])
+
+    def alive(self):
+        return sum(1 for snake in self.snakes if not snake.game_over)
+
+    def step(self):
+        # Ein Tick für alle Schlangen; gibt die Schrittzeit in ns zurück
+        start = time.perf_counter_ns()
+        cols, rows, grid = self.cols, self.rows, self.grid
+
+        # 1. Entscheiden, alle auf dem Stand zu Tickbeginn
+        self.heads = {snake.snake.index(snake.snake[0]) for snake in self.snakes if not snake.game_over}
+        proposals = []
+        for snake in self.snakes:
+            if snake.game_over:
+                continue
+            nearest = self.food.nearest(snake.snake[0])
+            snake.food = None if nearest is None else (nearest % cols, nearest // cols)
+            proposals.append((snake, self.policy(self, snake)))
+
+        # 2. Auflösen: Wand und Körper über das Raster, Kopf an Kopf über die beanspruchten Felder
+        dead = []
+        claims = {}
+        for snake, new_head in proposals:
+            if new_head is None:
+                dead.append((snake, snake.cause or "dead_end"))
+            elif not (0 <= new_head[0] < cols and 0 <= new_head[1] < rows):
+                dead.append((snake, "wall"))
+            elif grid[new_head[1] * cols + new_head[0]]:
+                dead.append((snake, "body"))
+            else:
+                claims.setdefault(new_head, []).append(snake)
+        movers = []
+        for new_head, contenders in claims.items():
+            if len(contenders) > 1:
+                dead.extend((snake, "head") for snake in contenders)
+            else:
+                movers.append((contenders[0], new_head))
+
+        # 3. Anwenden: Tote räumen, dann ziehen (Zielfelder waren frei, die Reihenfolge ist egal)
+        for snake, cause in dead:
+            snake.game_over = True
+            snake.death_cause = cause
+            self.deaths[cause] = self.deaths.get(cause, 0) + 1
+            board = snake.snake
+            while len(board):
+                board.pop_tail()
+        for snake, new_head in movers:
+            board = snake.snake
+            board.push_head(new_head)
+            snake.moves += 1
+            cell = new_head[1] * cols + new_head[0]
+            if cell in self.food:
+                self.food.remove(cell)
+                snake.score += 1
+                self.eaten += 1
+                if len(board) > snake.max_length:
+                    snake.max_length = len(board)
+                    self.best_length = max(self.best_length, snake.max_length)
+            else:
+                board.pop_tail()
+        if self.respawn:
+            for snake, _ in dead:
+                pos = self.random_free()
+                if pos is not None:
+                    self.snakes[snake.ident] = ArenaSnake.create(self, snake.ident, pos)
+        self.spawn_food()
+
+        self.ticks += 1
+        elapsed = time.perf_counter_ns() - start
+        self.tick_ns.record(elapsed)
+        return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Viele Schlangen auf einem Brett ohne Fenster")
+    parser.add_argument("--cols", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--snakes", type=int, default=300)
+    parser.add_argument("--foods", type=int, default=300)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-respawn", action="store_true", help="Tote Schlangen nicht neu starten")
+    parser.add_argument("--csv", default=None, help="Schrittzeit und lebende Schlangen pro Tick als CSV speichern")
+    args = parser.parse_args(argv)
+
+    arena = Arena(args.cols, args.rows, args.snakes, args.foods, args.policy, args.seed, not args.no_respawn)
+    samples = []
+    for tick in range(args.ticks):
+        alive = arena.alive()
+        if not alive:
+            break
+        samples.append((tick, alive, arena.step()))
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("tick", "alive", "step_ns"))
+            writer.writerows(samples)
+
+    summary = arena.tick_ns.summary()
+    steps = sum(alive for _, alive, _ in samples)
+    print(f"{arena.ticks} Ticks, {args.snakes} Schlangen auf {args.cols}x{args.rows}, Strategie {args.policy}")
+    print(f"Schrittzeit: Mittel {summary['mean'] / 1000:.0f} µs, p50 {summary['p50'] / 1000:.0f} µs, "
+          f"p99 {summary['p99'] / 1000:.0f} µs, max {summary['max'] / 1000:.0f} µs, "
+          f"{arena.tick_ns.sum / max(steps, 1) / 1000:.1f} µs pro Schlangenzug")
+    deaths = ", ".join(f"{cause} {count}" for cause, count in sorted(arena.deaths.items())) or "keine"
+    print(f"Futter gefressen: {arena.eaten}, längste Schlange: {arena.best_length}, Tode: {deaths}")
+
+
+if __name__ == "__main__":
+    main()
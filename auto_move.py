@@ -1,215 +1,262 @@
 from constants import *
 from utils import get_neighbors
-from pathfinding import a_star, generate_snake_path
+from pathfinding import a_star
+from reachability import Reachability, default_limit
+from tables import get_tables
+import planner
+from log import get_logger, DEBUG
+import profiler
 
-def is_safe_move(new_head, snake, width, height, log=True):
-    if (new_head[0] < 0 or new_head[0] >= width or 
-        new_head[1] < 0 or new_head[1] >= height or 
+logger = get_logger("auto_move")
+
+def is_safe_move(new_head, snake, cols, rows, log=True):
+    if (new_head[0] < 0 or new_head[0] >= cols or 
+        new_head[1] < 0 or new_head[1] >= rows or 
         new_head in snake):
         if log:
-            print(f"Log: Kollision oder außerhalb bei {new_head}")
+            logger.debug("Kollision oder außerhalb bei %s", new_head)
         return False
     return True
 
 def is_adjacent(pos1, pos2):
     x1, y1 = pos1
     x2, y2 = pos2
-    return abs(x1 - x2) + abs(y1 - y2) == GRID_SIZE
-
-def simulate_snake_after_move(self, new_head, eat_food=False):
-    new_snake = self.snake.copy()
-    new_snake.insert(0, new_head)
-    if not eat_food:
-        new_snake.pop()
-    print(f"Debug: Simulated snake: {new_snake[:5]}...")
-    return new_snake
-
-def generate_strategic_route():
-    route = []
-    for y in range(0, HEIGHT, GRID_SIZE):
-        if y % (2 * GRID_SIZE) == 0:  # Gerade Zeilen: links nach rechts
-            for x in range(0, WIDTH - GRID_SIZE, GRID_SIZE):  # Bis x=560, x=580 frei
-                route.append((x, y))
-        else:  # Ungerade Zeilen: rechts nach links
-            for x in range(WIDTH - 2 * GRID_SIZE, -GRID_SIZE, -GRID_SIZE):  # Von 560 nach 0
-                route.append((x, y))
-    return route
-
-def find_next_strategic_point(self, current_pos, route):
-    for i, point in enumerate(route):
-        if is_adjacent(current_pos, point) and point not in self.snake:
-            print(f"Debug: Strategische Route - Aktuell: {current_pos}, Nächster Punkt: {point}, Index: {i}")
-            return point, i
-    print(f"Debug: Kein benachbarter strategischer Punkt für {current_pos}")
-    return None, None
+    return abs(x1 - x2) + abs(y1 - y2) == 1
+
+def find_next_path_point(self, head):
+    # Nachfolger des Kopfes auf dem Hamilton-Zyklus, per Tabelle in O(1)
+    next_point = self.cycle.next_point(head)
+    if is_adjacent(head, next_point):
+        return next_point
+    return None
 
 def count_reachable(self, start, snake, max_depth=50):
-    visited = set(snake)
-    queue = [(start, 0)]
-    count = 0
-    while queue and count < TOTAL_CELLS:
-        pos, depth = queue.pop(0)
-        if pos not in visited and depth <= max_depth:
-            visited.add(pos)
-            count += 1
-            for neighbor in get_neighbors(pos, WIDTH, HEIGHT, snake):
-                if neighbor not in visited and neighbor not in snake:
-                    queue.append((neighbor, depth + 1))
-    print(f"Debug: Erreichbare Felder von {start} mit Schlange {snake[:5]}...: {count}")
+    # Breitensuche ab start (dem simulierten Kopf) über freie Felder, höchstens max_depth Schritte weit.
+    # Belegung kommt aus dem Raster, Besuche aus einer Menge; die Kosten hängen nur von max_depth ab.
+    adjacency = get_tables(snake.cols, snake.rows).adjacency
+    grid = snake.grid
+    first = snake.index(start)
+    visited = {first}
+    frontier = [first]
+    count = 1
+    depth = 0
+    while frontier and depth < max_depth:
+        depth += 1
+        next_frontier = []
+        for cell in frontier:
+            first = 4 * cell
+            for neighbor in adjacency[first:first + 4]:
+                if neighbor >= 0 and not grid[neighbor] and neighbor not in visited:
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+        count += len(next_frontier)
+        frontier = next_frontier
+    if logger.isEnabledFor(DEBUG):
+        logger.debug("Erreichbare Felder von %s mit Schlange %s...: %s", start, snake[:5], count)
     return count
 
 def auto_move(self):
-    if self.game_over or len(self.snake) >= TOTAL_CELLS:
+    if self.game_over or len(self.snake) >= self.cells:
         if not self.game_over:
-            self.game_over = True
-            print(f"Log: Spielende erreicht, Score: {self.score}, Coverage: {(self.max_length / TOTAL_CELLS) * 100:.1f}%")
+            logger.info("Spielende erreicht, Score: %s, Coverage: %.1f%%", self.score, self.get_coverage())
+            self.end_game("board_full")
         return
 
     head = self.snake[0]
     new_head = None
     recent_moves = self.snake[:10]
+    cols, rows = self.cols, self.rows
+    strategic_length = self.strategic_length
+    # Auf großen Brettern begrenzte Flutfüllung und A*-Suche, damit ein Tick nicht mit der Brettgröße wächst
+    limit = default_limit(self.snake)
 
-    print(f"Debug: Head bei {head}, Länge: {len(self.snake)}, Futter: {self.food}, Score: {self.score}")
-
-    # Strategische Route ab Länge 81 (80 Punkte)
-    if len(self.snake) >= 81:
-        if not hasattr(self, 'strategic_route'):
-            self.strategic_route = generate_strategic_route()
-            self.route_index = 0
-        # Zum Startpunkt (0, 0) navigieren, falls nicht dort
-        if head != (0, 0):
-            path_to_start = a_star(head, (0, 0), WIDTH, HEIGHT, self.snake)
-            if path_to_start and len(path_to_start) > 1:
-                new_head = path_to_start[1]
-                if is_adjacent(head, new_head) and is_safe_move(new_head, self.snake, WIDTH, HEIGHT):
-                    print(f"Log: Navigiere zu Startpunkt bei {new_head}")
-                else:
-                    new_head = None
+    # Einmal pro Tick prüfen; ausgeschaltetes Debug-Logging kostet in den Schleifen dann nichts
+    debug = logger.isEnabledFor(DEBUG)
+    if debug:
+        logger.debug("Head bei %s, Länge: %s, Futter: %s, Score: %s", head, len(self.snake), self.food, self.score)
+    # Phasen-Profiler: ausgeschaltet bleibt es bei dieser einen Abfrage und den "if prof"-Zweigen
+    prof = profiler.active
+    if prof:
+        prof.begin_tick()
+    branch = None
+
+    # Strategische Route ab strategic_length (81 = 80 Punkte auf dem Standardbrett): Hamilton-Zyklus mit sicheren Abkürzungen.
+    # Garantiert sicher ist sie erst, wenn der Körper in Zyklusreihenfolge liegt; bis dahin bleiben die Schritte 1 bis 3
+    # (Futter, Raum, Zyklus) als Ausweichen aktiv.
+    cycle_move = False
+    hunting = True
+    if len(self.snake) >= strategic_length:
+        if not self.cycle_ordered:
+            self.cycle_ordered = self.cycle.is_ordered(self.snake)
+        if self.cycle_ordered:
+            hunting = False
+            new_head = self.cycle.shortcut_step(self.snake, self.food)
+            cycle_move = new_head is not None
+            if debug:
+                logger.debug("Zyklus (geordnet) bei %s, Index: %s", new_head, self.cycle.index(new_head) if new_head else None)
         else:
-            # Folge der strategischen Route
-            next_point, index = find_next_strategic_point(self, head, self.strategic_route)
-            if next_point and is_safe_move(next_point, self.snake, WIDTH, HEIGHT):
+            # Körper liegt noch nicht in Zyklusreihenfolge: dem Zyklus folgen, bis er es tut, aber nur wenn die
+            # nächsten len(snake) Felder des Zyklus rechtzeitig frei werden; sonst weiter mit den Schritten 1 bis 3
+            next_point = find_next_path_point(self, head)
+            if (next_point and is_safe_move(next_point, self.snake, cols, rows)
+                    and self.cycle.is_clear_ahead(self.snake, self.food)):
                 new_head = next_point
-                self.route_index = index + 1
-                print(f"Log: Strategische Route bei {new_head}")
+                logger.debug("Strategische Route bei %s", new_head)
 
-    # Schritt 1: Futterjagd (bis Länge 80)
-    if not new_head and len(self.snake) < 81:
-        path_to_food = a_star(head, self.food, WIDTH, HEIGHT, self.snake)
-        print(f"Debug: Path to food: {path_to_food[:2] if path_to_food else 'None'}")
+    if prof:
+        prof.mark("strategisch")
+    if new_head and not branch:
+        branch = "strategisch"
+
+    # Schritt 1: Futterjagd (bis der Körper auf dem Zyklus liegt)
+    if not new_head and hunting:
+        # Erst den Cache fragen: nach einem Zug entlang des letzten Pfades liegt dessen Rest dort schon bereit
+        # path_checked: der Treffer ist der Rest eines Weges, der genau für diesen Stand schon als sicher gilt
+        path_to_food, path_checked = self.cache.path(self.snake, self.food)
+        if path_to_food is None:
+            expansions = None if limit is None else 8 * (abs(head[0] - self.food[0]) + abs(head[1] - self.food[1])) + limit
+            path_to_food = a_star(head, self.food, cols, rows, self.snake, max_expansions=expansions)
+        if debug:
+            logger.debug("Path to food: %s", path_to_food[:2] if path_to_food else None)
+        # Ohne sicheren Weg zum Futter tiefer suchen (Budget pro Tick); nur Züge, nach denen der Schwanz
+        # erreichbar bleibt
+        search = False
         if path_to_food and len(path_to_food) > 1:
             potential_new_head = path_to_food[1]
-            if is_adjacent(head, potential_new_head) and is_safe_move(potential_new_head, self.snake, WIDTH, HEIGHT):
-                simulated_snake = simulate_snake_after_move(self, potential_new_head, eat_food=True)
-                food_dist = abs(head[0] - self.food[0]) + abs(head[1] - self.food[1])
-                max_food_dist = TOTAL_CELLS - len(self.snake)
-                if food_dist < max_food_dist:
+            if is_adjacent(head, potential_new_head) and is_safe_move(potential_new_head, self.snake, cols, rows):
+                # Virtuelle Schlange den Weg entlang schicken: erreicht sie danach ihren Schwanz noch?
+                if path_checked or planner.path_is_safe(self.snake, path_to_food, limit):
                     new_head = potential_new_head
+                    self.cache.store_path(self.snake, self.food, path_to_food)
                     self.current_speed = self.base_speed
                     self.path_fail_count = 0
-                    print(f"Log: Sicherer Zug zum Futter bei {new_head}, Score: {self.score + 1}")
+                    logger.debug("Sicherer Zug zum Futter bei %s, Score: %s", new_head, self.score + 1)
                 else:
-                    print(f"Log: Futter bei {self.food} zu weit (Distanz: {food_dist}, Max: {max_food_dist})")
+                    search = True
             else:
-                print(f"Log: Unsicherer oder nicht benachbarter Zug zum Futter bei {potential_new_head}")
+                logger.debug("Unsicherer oder nicht benachbarter Zug zum Futter bei %s", potential_new_head)
         else:
-            print("A* Pfad zum Futter nicht gefunden")
+            logger.debug("A* Pfad zum Futter nicht gefunden")
+            search = True
             self.path_fail_count += 1
             if self.path_fail_count > 5:
                 self.food = self.spawn_food()
                 self.path_fail_count = 0
+        if search and self.food is not None:
+            move, safe, value, depth = planner.plan(self, planner.node_budget(self), limit,
+                                                    deadline=planner.deadline_for(self))
+            if safe:
+                new_head = move
+                branch = "planer"
+                logger.debug("Planer wählt %s (Wert %s, Tiefe %s)", new_head, value, depth)
+            else:
+                logger.debug("Kein sicherer Weg zum Futter bei %s, Planer ohne sicheren Zug", self.food)
+
+    if prof:
+        prof.mark("futter")
+    if new_head and not branch:
+        branch = "futter"
 
-    # Schritt 2: Raum maximieren (Fallback bis 80)
-    if not new_head and len(self.snake) < 81:
-        neighbors = get_neighbors(head, WIDTH, HEIGHT, self.snake)
-        print(f"Debug: Neighbors: {neighbors}")
+    # Schritt 2: Raum maximieren (Fallback bis der Körper auf dem Zyklus liegt)
+    if not new_head and hunting:
+        neighbors = get_neighbors(head, cols, rows, self.snake)
+        if debug:
+            logger.debug("Neighbors: %s", neighbors)
         max_score = -float('inf')
         best_neighbor = None
         tail = self.snake[-1]
+        is_at_wall = get_tables(cols, rows).wall_distance[self.snake.index(head)] == 0
+        # Freie Flächen einmal pro Tick beschriften; die Fläche je Nachbar ist dann ein Tabellenzugriff
+        areas = dict(Reachability(self.snake, limit=limit).areas_after_move(head))
         for neighbor in neighbors:
             if neighbor not in self.snake and is_adjacent(head, neighbor):
                 if neighbor in recent_moves and len(neighbors) > 1:
-                    print(f"Debug: Skipping {neighbor} - recently visited")
+                    if debug:
+                        logger.debug("Skipping %s - recently visited", neighbor)
                     continue
-                simulated_snake = simulate_snake_after_move(self, neighbor)
-                reachable = count_reachable(self, neighbor, simulated_snake)
+                reachable = areas[neighbor]
                 food_dist = abs(neighbor[0] - self.food[0]) + abs(neighbor[1] - self.food[1])
                 tail_dist = abs(neighbor[0] - tail[0]) + abs(neighbor[1] - tail[1])
-                is_at_wall = head[0] == 0 or head[0] == WIDTH - GRID_SIZE or head[1] == 0 or head[1] == HEIGHT - GRID_SIZE
-                center_bonus = 50 * (abs(neighbor[0] - WIDTH // 2) + abs(neighbor[1] - HEIGHT // 2)) / (WIDTH + HEIGHT)
+                center_bonus = 50 * (abs(neighbor[0] - cols / 2) + abs(neighbor[1] - rows / 2)) / (cols + rows)
                 wall_penalty = -200 if is_at_wall and head[1] == neighbor[1] else 0
                 vertical_bonus = 100 if head[1] != neighbor[1] else 0
-                tail_weight = 5 if is_at_wall and head[0] != neighbor[0] else (20 if is_at_wall else 2)
-                score = reachable + vertical_bonus - food_dist / GRID_SIZE + tail_dist / tail_weight + wall_penalty - center_bonus
-                print(f"Debug: Nachbar {neighbor} - Score: {score}, Erreichbare Felder: {reachable}, Tail-Dist: {tail_dist}")
-                if score > max_score and is_safe_move(neighbor, self.snake, WIDTH, HEIGHT):
+                # Gewichte pro Feld Abstand (früher Pixelabstand / 5, / 20, / 2 bei 20 Pixeln pro Feld)
+                tail_weight = 4 if is_at_wall and head[0] != neighbor[0] else (1 if is_at_wall else 10)
+                score = reachable + vertical_bonus - food_dist + tail_dist * tail_weight + wall_penalty - center_bonus
+                if debug:
+                    logger.debug("Nachbar %s - Score: %s, Erreichbare Felder: %s, Tail-Dist: %s", neighbor, score, reachable, tail_dist)
+                if score > max_score and is_safe_move(neighbor, self.snake, cols, rows):
                     max_score = score
                     best_neighbor = neighbor
         if best_neighbor:
             new_head = best_neighbor
             self.current_speed = self.base_speed
             self.path_fail_count = max(0, self.path_fail_count - 1)
-            print(f"Log: Raum maximiert bei {new_head}")
+            logger.debug("Raum maximiert bei %s", new_head)
         else:
             self.path_fail_count += 1
             self.current_speed = max(self.base_speed / (1 + self.path_fail_count * 0.5), 1)
-            print(f"Log: Kein optimaler Nachbar bei {head}, Nachbarn: {neighbors}")
+            logger.info("Kein optimaler Nachbar bei %s, Nachbarn: %s", head, neighbors)
 
-    # Schritt 3: Hamilton-Zyklus (Fallback bis 80)
-    if not new_head and len(self.snake) < 81:
-        if not hasattr(self, 'path'):
-            self.path = generate_snake_path(WIDTH, HEIGHT, ROWS, COLS)
-            self.path_index = 0
+    if prof:
+        prof.mark("raum")
+    if new_head and not branch:
+        branch = "raum"
+
+    # Schritt 3: Hamilton-Zyklus (Fallback bis der Körper auf dem Zyklus liegt)
+    if not new_head and hunting:
         next_step = find_next_path_point(self, head)
-        if next_step and is_safe_move(next_step, self.snake, WIDTH, HEIGHT):
+        if next_step and is_safe_move(next_step, self.snake, cols, rows):
             new_head = next_step
             self.path_index += 1
             self.current_speed = self.base_speed
             self.path_fail_count = max(0, self.path_fail_count - 1)
-            print(f"Log: Hamilton-Zyklus bei {new_head}")
-        else:
-            if self.path_fail_count > 5:
-                self.path = generate_snake_path(WIDTH, HEIGHT, ROWS, COLS)
-                self.path_index = 0
-                self.path_fail_count = 0
-                print("Debug: Hamilton-Pfad zurückgesetzt wegen zu vieler Fehlschläge")
+            logger.debug("Hamilton-Zyklus bei %s", new_head)
+
+    if prof:
+        prof.mark("hamilton")
+    if new_head and not branch:
+        branch = "hamilton"
 
     # Schritt 4: Notfall-Zug
     if not new_head:
-        neighbors = get_neighbors(head, WIDTH, HEIGHT, self.snake)
-        print(f"Debug: Notfall-Neighbors: {neighbors}")
+        neighbors = get_neighbors(head, cols, rows, self.snake)
+        if debug:
+            logger.debug("Notfall-Neighbors: %s", neighbors)
         for neighbor in neighbors:
             if neighbor not in self.snake and is_adjacent(head, neighbor):
-                if neighbor not in recent_moves and is_safe_move(neighbor, self.snake, WIDTH, HEIGHT):
+                if neighbor not in recent_moves and is_safe_move(neighbor, self.snake, cols, rows):
                     new_head = neighbor
                     self.current_speed = self.base_speed
                     self.path_fail_count = max(0, self.path_fail_count - 1)
-                    print(f"Log: Notfall-Zug bei {new_head}")
+                    logger.info("Notfall-Zug bei %s", new_head)
                     break
         else:
             self.path_fail_count += 1
             self.current_speed = max(self.base_speed / (1 + self.path_fail_count * 0.5), 1)
-            print("Log: Kein Notfall-Zug möglich")
+            logger.info("Kein Notfall-Zug möglich")
+
+    if prof:
+        prof.mark("notfall")
+    if new_head and not branch:
+        branch = "notfall"
 
     # Schritt 5: Spielende
-    if not new_head or new_head == head or new_head in self.snake:
+    if not new_head or not is_adjacent(head, new_head) or new_head in self.snake:
         if not self.game_over:
-            self.game_over = True
-            print(f"Log: Sackgasse oder Kollision bei {head}, new_head={new_head}, Coverage: {(self.max_length / TOTAL_CELLS) * 100:.1f}%")
+            logger.info("Sackgasse oder Kollision bei %s, new_head=%s, Coverage: %.1f%%", head, new_head, self.get_coverage())
+            self.end_game("dead_end" if not new_head or not is_adjacent(head, new_head) else "collision")
+        if prof:
+            prof.end_tick("ende")
         return
 
     # Schritt 6: Bewege Schlange
-    self.snake.insert(0, new_head)
-    self.visited.add(new_head)
-    if new_head == self.food:
-        self.score += 1
-        self.food = self.spawn_food()
-        self.max_length = max(self.max_length, len(self.snake))
-        if len(self.snake) >= 81:
-            next_hamilton = find_next_strategic_point(self, new_head, self.strategic_route)[0]
-            if next_hamilton:
-                self.route_index -= 1
-        print(f"Log: Futter gegessen, neue Position: {new_head}")
+    # Nur Züge aus shortcut_step halten die Zyklusreihenfolge sicher ein; sonst beim nächsten Tick neu prüfen
+    self.cycle_ordered = cycle_move
+    if self.advance(new_head):
+        logger.debug("Futter gegessen, neue Position: %s", new_head)
     else:
-        self.snake.pop()
-        print(f"Log: Schritt gemacht zu {new_head}")
\ No newline at end of file
+        logger.debug("Schritt gemacht zu %s", new_head)
+    if prof:
+        prof.mark("bewegen")
+        prof.end_tick(branch)
@@ -0,0 +1,236 @@
+# batch_env.py
+# N Spielbretter als NumPy-Arrays, die mit einem Aufruf gemeinsam einen Zug machen (für Solver-Suche und Training).
+# Regeln wie SnakeCore.manual_move: Wand oder belegtes Feld (auch der Schwanz, der erst nach dem Test
+# weiterrückt) beendet die Partie; Futter verlängert um eins und wird gleichverteilt neu gesetzt.
+# Beendete Bretter starten im selben step() neu.
+#
+# Zustand pro Brett: Belegungsraster (occupancy), Körper als Ringpuffer von Feldindizes (body, head, tail),
+# Futterfeld (food, -1 = Brett voll), Richtung, Punkte und Züge.
+#
+# Aufruf (Durchsatz messen): python batch_env.py --boards 4096 --steps 2000
+#        (Regeln gegen manual_move prüfen): python batch_env.py --verify 300
+import argparse
+import sys
+import time
+import numpy as np
+from constants import COLS, ROWS, UP, DOWN, LEFT, RIGHT
+from core import SnakeCore
+
+ACTIONS = (UP, DOWN, LEFT, RIGHT)  # Aktion i bewegt den Kopf um ACTIONS[i]; wie die Zugcodes in replay.py
+CAUSES = ("", "wall", "self", "board_full")  # death_cause-Codes
+START_DIRECTION = ACTIONS.index(RIGHT)
+
+
+class BatchEnv:
+    def __init__(self, boards, cols=COLS, rows=ROWS, seed=None):
+        self.n = boards
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.rng = np.random.default_rng(seed)
+        self.dx = np.array([d[0] for d in ACTIONS], dtype=np.int64)
+        self.dy = np.array([d[1] for d in ACTIONS], dtype=np.int64)
+        self.occupancy = np.zeros((boards, self.cells), dtype=np.uint8)
+        self.body = np.zeros((boards, self.cells), dtype=np.int64)  # Ringpuffer, body[b, head[b]] ist der Kopf
+        self.head = np.zeros(boards, dtype=np.int64)
+        self.tail = np.zeros(boards, dtype=np.int64)
+        self.length = np.zeros(boards, dtype=np.int64)
+        self.food = np.zeros(boards, dtype=np.int64)
+        self.direction = np.zeros(boards, dtype=np.int64)
+        self.score = np.zeros(boards, dtype=np.int64)
+        self.moves = np.zeros(boards, dtype=np.int64)
+        self.death_cause = np.zeros(boards, dtype=np.int8)  # Code des letzten Spielendes je Brett
+        self.episodes = 0
+        self.last_boards = self.last_score = self.last_moves = np.zeros(0, dtype=np.int64)
+        self.reset(np.arange(boards))
+
+    def reset(self, boards):
+        # Bretter neu starten: Länge 1 in der Ecke oben links (Start des Hamilton-Zyklus), Richtung rechts
+        boards = np.asarray(boards)
+        if not len(boards):
+            return
+        self.occupancy[boards] = 0
+        self.body[boards, 0] = 0
+        self.occupancy[boards, 0] = 1
+        self.head[boards] = 0
+        self.tail[boards] = 0
+        self.length[boards] = 1
+        self.direction[boards] = START_DIRECTION
+        self.score[boards] = 0
+        self.moves[boards] = 0
+        self.spawn_food(boards)
+
+    def spawn_food(self, boards):
+        # Gleichverteilt ein freies Feld je Brett: erst Zufallsfelder mit Verwerfen (fast immer nach
+        # wenigen Runden fertig), für den Rest eine maskierte Zufallsauswahl über alle Felder
+        pending = np.asarray(boards)
+        for _ in range(8):
+            if not len(pending):
+                return
+            cells = self.rng.integers(0, self.cells, len(pending))
+            free = self.occupancy[pending, cells] == 0
+            self.food[pending[free]] = cells[free]
+            pending = pending[~free]
+        if not len(pending):
+            return
+        weights = self.rng.random((len(pending), self.cells))
+        weights[self.occupancy[pending] != 0] = -1.0
+        choice = weights.argmax(axis=1)
+        self.food[pending] = np.where(weights[np.arange(len(pending)), choice] >= 0, choice, -1)
+
+    def step(self, actions):
+        # actions: Aktion je Brett (Index in ACTIONS, -1 = Richtung beibehalten).
+        # Gibt (ate, done) als bool-Arrays zurück. Beendete Bretter sind danach schon neu gestartet;
+        # ihre Kennzahlen stehen in last_boards, last_score, last_moves und death_cause.
+        actions = np.asarray(actions, dtype=np.int64)
+        self.direction = np.where(actions >= 0, actions, self.direction)
+        all_boards = np.arange(self.n)
+        head_cell = self.body[all_boards, self.head]
+        x = head_cell % self.cols + self.dx[self.direction]
+        y = head_cell // self.cols + self.dy[self.direction]
+
+        wall = (x < 0) | (x >= self.cols) | (y < 0) | (y >= self.rows)
+        new_cell = np.where(wall, 0, y * self.cols + x)
+        hit_self = ~wall & (self.occupancy[all_boards, new_cell] != 0)
+        alive = ~(wall | hit_self)
+
+        moving = all_boards[alive]
+        new_cell = new_cell[alive]
+        ate = np.zeros(self.n, dtype=bool)
+        ate[moving] = new_cell == self.food[moving]
+
+        # Kopf setzen
+        self.head[moving] = (self.head[moving] + 1) % self.cells
+        self.body[moving, self.head[moving]] = new_cell
+        self.occupancy[moving, new_cell] = 1
+        self.moves[moving] += 1
+
+        # Ohne Futter rückt der Schwanz nach
+        shrinking = all_boards[alive & ~ate]
+        tail_cell = self.body[shrinking, self.tail[shrinking]]
+        self.occupancy[shrinking, tail_cell] = 0
+        self.tail[shrinking] = (self.tail[shrinking] + 1) % self.cells
+
+        eating = all_boards[ate]
+        self.length[eating] += 1
+        self.score[eating] += 1
+        full = np.zeros(self.n, dtype=bool)
+        full[eating] = self.length[eating] >= self.cells
+        self.spawn_food(all_boards[ate & ~full])
+
+        done = wall | hit_self | full
+        cause = np.where(wall, 1, np.where(hit_self, 2, 3)).astype(np.int8)
+        finished = all_boards[done]
+        self.death_cause[finished] = cause[done]
+        # Kennzahlen der beendeten Partien vor dem Neustart sichern
+        self.last_score = self.score[finished].copy()
+        self.last_moves = self.moves[finished].copy()
+        self.last_boards = finished
+        self.episodes += len(finished)
+        self.reset(finished)
+        return ate, done
+
+    def cells_of(self, board):
+        # Körper eines Bretts vom Kopf zum Schwanz als (Spalte, Zeile), z.B. zum Vergleich mit SnakeCore
+        length = int(self.length[board])
+        ring = (self.head[board] - np.arange(length)) % self.cells
+        return [(int(c) % self.cols, int(c) // self.cols) for c in self.body[board, ring]]
+
+
+# Zufallspolitik ohne Umkehr in den eigenen Hals: Richtung behalten oder nach links/rechts drehen
+TURN = np.array([[0, 2, 3], [1, 2, 3], [2, 0, 1], [3, 0, 1]])
+
+
+def _verify_action(game, choices, rng):
+    head_x, head_y = game.snake[0]
+    safe = []
+    for action in choices:
+        x, y = head_x + ACTIONS[action][0], head_y + ACTIONS[action][1]
+        if 0 <= x < game.cols and 0 <= y < game.rows and (x, y) not in game.snake:
+            safe.append((action, x, y))
+    if not safe or rng.random() < 0.01:
+        return int(choices[rng.integers(0, len(choices))])
+    if game.food is not None and rng.random() < 0.7:
+        food_x, food_y = game.food
+        safe.sort(key=lambda move: abs(move[1] - food_x) + abs(move[2] - food_y))
+        return int(safe[0][0])
+    return int(safe[rng.integers(0, len(safe))][0])
+
+
+def verify(games, cols=COLS, rows=ROWS, seed=1):
+    # Dieselben Züge auf einem Brett der BatchEnv und auf SnakeCore.manual_move; nach jedem Zug müssen
+    # Körper, Punkte und Spielende übereinstimmen. Die Züge meiden meist Wand und Körper und laufen eher zum
+    # Futter, damit die Partien lang werden und oft fressen; ab und zu ist einer beliebig (auch tödlich). Das Futter zieht SnakeCore mit eigenem Zufallsgenerator
+    # (nur erreichbare Felder), es wird daher in die BatchEnv übernommen.
+    # Gibt die Liste der Abweichungen zurück (leer = gleiche Regeln).
+    env = BatchEnv(1, cols, rows, seed)
+    rng = np.random.default_rng(seed)
+    mismatches = []
+    moves = eaten = 0
+    for game_index in range(games):
+        game = SnakeCore(seed + game_index, cols=cols, rows=rows)
+        game.auto_mode = False
+        where = f"Partie {game_index} (Seed {seed + game_index})"
+        if env.cells_of(0) != list(game.snake):
+            mismatches.append(f"{where}: Start {env.cells_of(0)} statt {list(game.snake)}")
+            continue
+        while not game.game_over:
+            env.food[0] = -1 if game.food is None else game.snake.index(game.food)
+            action = _verify_action(game, TURN[env.direction[0]], rng)
+            game.direction = ACTIONS[action]
+            game.manual_move()
+            ate, done = env.step([action])
+            moves += 1
+            eaten += int(ate[0])
+            if bool(done[0]) != game.game_over:
+                mismatches.append(f"{where}, Zug {game.moves}: Spielende {bool(done[0])} statt {game.game_over}")
+                break
+            if done[0]:
+                cause = CAUSES[env.death_cause[0]]
+                if cause != game.death_cause or int(env.last_score[0]) != game.score:
+                    mismatches.append(f"{where}: Ende {cause} mit {int(env.last_score[0])} Punkten statt "
+                                      f"{game.death_cause} mit {game.score}")
+            elif env.cells_of(0) != list(game.snake) or int(env.score[0]) != game.score:
+                mismatches.append(f"{where}, Zug {game.moves}: Körper oder Punkte weichen ab")
+                break
+        if not done[0]:
+            # Nach einem Abbruch das Brett für die nächste Partie neu starten
+            env.reset(np.arange(1))
+    print(f"{games} Partien, {moves} Züge und {eaten} Mal Futter verglichen, {len(mismatches)} Abweichungen")
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Durchsatz des NumPy-Batch-Environments messen")
+    parser.add_argument("--boards", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--cols", type=int, default=COLS)
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--verify", type=int, default=None, metavar="PARTIEN",
+                        help="Statt zu messen so viele Partien Zug für Zug mit SnakeCore.manual_move vergleichen")
+    args = parser.parse_args(argv)
+
+    if args.verify is not None:
+        mismatches = verify(args.verify, args.cols, args.rows, args.seed)
+        for mismatch in mismatches[:10]:
+            print(mismatch)
+        return 1 if mismatches else 0
+
+    env = BatchEnv(args.boards, args.cols, args.rows, args.seed)
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    eaten = 0
+    for _ in range(args.steps):
+        actions = TURN[env.direction, rng.integers(0, 3, args.boards)]
+        ate, done = env.step(actions)
+        eaten += int(ate.sum())
+    elapsed = time.perf_counter() - start
+    total = args.boards * args.steps
+    print(f"{total} Brett-Züge in {elapsed:.2f} s: {total / elapsed:,.0f} Brett-Züge/s, "
+          f"{env.episodes} Partien beendet, {eaten} Futter gefressen")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
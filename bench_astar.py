@@ -0,0 +1,89 @@
+# bench_astar.py
+# Mikro-Benchmark: neues A* auf Feldindizes gegen die alte Variante mit Pixel-Tupeln und Dicts.
+# Aufruf: python bench_astar.py [--runs 200] [--seed 1]
+import argparse
+import random
+import time
+from heapq import heappush, heappop
+from constants import WIDTH, HEIGHT, GRID_SIZE, ROWS, COLS
+from board import Board
+from pathfinding import a_star, generate_snake_path
+from utils import heuristic
+
+
+def legacy_get_neighbors(pos, width, height, snake):
+    x, y = pos
+    possible = [(x + 20, y), (x - 20, y), (x, y + 20), (x, y - 20)]
+    return [p for p in possible if 0 <= p[0] < width and 0 <= p[1] < height and p not in snake[1:]]
+
+
+def legacy_a_star(start, goal, width, height, snake):
+    # Stand vor der Umstellung: frische Dicts pro Aufruf, doppelte Heap-Einträge, Listen-Scans
+    open_set = []
+    heappush(open_set, (0, start))
+    came_from = {}
+    g_score = {start: 0}
+    f_score = {start: heuristic(start, goal)}
+    while open_set:
+        current = heappop(open_set)[1]
+        if current == goal:
+            path = []
+            while current in came_from:
+                path.append(current)
+                current = came_from[current]
+            path.append(start)
+            return path[::-1]
+        for neighbor in legacy_get_neighbors(current, width, height, snake):
+            tentative_g_score = g_score[current] + 20
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
+                heappush(open_set, (f_score[neighbor], neighbor))
+    return None
+
+
+def to_pixels(positions):
+    # Die alte Variante rechnet in Pixeln, das neue A* in Feldern
+    return [(x * GRID_SIZE, y * GRID_SIZE) for x, y in positions]
+
+
+def make_cases(length, count, rng):
+    # Schlange entlang des Zickzack-Pfads, Kopf am Ende; Ziele sind zufällige freie Felder
+    path = generate_snake_path(COLS, ROWS)
+    snake = path[:length][::-1]
+    occupied = set(snake)
+    free = [p for p in path if p not in occupied]
+    return snake, [rng.choice(free) for _ in range(count)]
+
+
+def time_calls(fn, goals):
+    start = time.perf_counter()
+    found = 0
+    for goal in goals:
+        if fn(goal):
+            found += 1
+    return time.perf_counter() - start, found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="A*-Mikro-Benchmark")
+    parser.add_argument("--runs", type=int, default=200, help="Suchen pro Schlangenlänge")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"{'Länge':>6} {'alt (µs)':>10} {'neu (µs)':>10} {'Faktor':>7} {'Pfade alt/neu':>14}")
+    for length in (1, 40, 80, 160, 300):
+        snake, goals = make_cases(length, args.runs, rng)
+        board = Board(COLS, ROWS, snake)
+        pixel_snake, pixel_goals = to_pixels(snake), to_pixels(goals)
+        legacy_time, legacy_found = time_calls(
+            lambda g: legacy_a_star(pixel_snake[0], g, WIDTH, HEIGHT, pixel_snake), pixel_goals)
+        new_time, new_found = time_calls(lambda g: a_star(snake[0], g, COLS, ROWS, board), goals)
+        print(f"{length:>6} {legacy_time / args.runs * 1e6:>10.1f} {new_time / args.runs * 1e6:>10.1f} "
+              f"{legacy_time / new_time:>7.1f} {legacy_found:>7}/{new_found}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# benchmark.py
+# Reproduzierbare Benchmarks für die heißen Pfade (A*, Nachbarn, Erreichbarkeit, Futter, auto_move).
+# Aufruf:
+#   python benchmark.py run --save bench_baseline.json        # messen und als Basis speichern
+#   python benchmark.py compare bench_baseline.json           # erneut messen, Regressionen > 10% melden
+import argparse
+import copy
+import json
+import platform
+import sys
+import time
+from constants import *
+from board import Board
+from core import SnakeCore
+from headless import play_game
+from pathfinding import a_star
+from utils import get_neighbors
+from auto_move import auto_move, count_reachable
+from transposition import DecisionCache
+
+FIXTURE_LENGTHS = {"leer": 1, "lang80": 80, "lang200": 200, "halbvoll": TOTAL_CELLS // 2}
+# Große Bretter: Kosten pro Tick sollen mit der Schlange wachsen, nicht mit der Feldzahl
+LARGE_FIXTURES = {"200x200": (200, 200, 500), "1000x1000": (1000, 1000, 500)}
+
+
+def make_fixture(length, seed=1, cols=COLS, rows=ROWS):
+    # Schlange entlang des Hamilton-Zyklus (Kopf vorne), Futter per Seed; gleicher Seed = gleiches Brett
+    game = SnakeCore(seed, cols=cols, rows=rows)
+    order = game.cycle.order[:length]
+    game.snake = Board(cols, rows, [game.cycle.pos(cell) for cell in reversed(order)])
+    game.visited = set(game.snake)
+    game.food = game.spawn_food()
+    game.cycle_ordered = game.cycle.is_ordered(game.snake)
+    return game
+
+
+def clone(game):
+    # Unabhängige Kopie für Benchmarks, die den Zustand verändern. Mit leerem Entscheidungs-Cache, sonst
+    # misst jeder Aufruf nach dem ersten nur noch einen Cache-Treffer.
+    twin = copy.copy(game)
+    twin.snake = game.snake.copy()
+    twin.visited = set(game.visited)
+    twin.rng = copy.deepcopy(game.rng)
+    twin.cache = DecisionCache()
+    return twin
+
+
+def measure(fn, setup=None, min_time=0.5, batch_time=50e-6):
+    # Läuft fn in Blöcken von je ~batch_time; liefert Zeiten pro Aufruf (Sekunden) für jeden Block.
+    # setup() erzeugt frische Argumente pro Aufruf und wird nicht mitgemessen.
+    args = setup() if setup else ()
+    start = time.perf_counter()
+    fn(*args)
+    single = max(time.perf_counter() - start, 1e-7)
+    batch = 1 if setup else max(1, int(batch_time / single))
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline or len(samples) < 5:
+        if setup:
+            args = setup()
+        start = time.perf_counter()
+        for _ in range(batch):
+            fn(*args)
+        samples.append((time.perf_counter() - start) / batch)
+    return samples
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+def stats(samples):
+    values = sorted(samples)
+    mean = sum(values) / len(values)
+    return {
+        "ops_per_sec": 1.0 / mean,
+        "mean_us": mean * 1e6,
+        "p50_us": percentile(values, 50) * 1e6,
+        "p90_us": percentile(values, 90) * 1e6,
+        "p99_us": percentile(values, 99) * 1e6,
+        "samples": len(values),
+    }
+
+
+def cases():
+    # (Name, Funktion, Setup) für jede Kombination aus Brett und Messpunkt
+    for name, length in FIXTURE_LENGTHS.items():
+        game = make_fixture(length)
+        snake, head = game.snake, game.snake[0]
+        yield f"a_star/{name}", lambda g=game: a_star(g.snake[0], g.food, COLS, ROWS, g.snake), None
+        yield f"get_neighbors/{name}", lambda s=snake, h=head: get_neighbors(h, COLS, ROWS, s), None
+        yield f"count_reachable/{name}", lambda g=game: count_reachable(g, g.snake[0], g.snake), None
+        yield f"spawn_food/{name}", lambda g=game: g.spawn_food(), None
+        yield f"auto_move_tick/{name}", auto_move, lambda g=game: (clone(g),)
+    for name, (cols, rows, length) in LARGE_FIXTURES.items():
+        game = make_fixture(length, cols=cols, rows=rows)
+        yield f"spawn_food/{name}", lambda g=game: g.spawn_food(), None
+        yield f"auto_move_tick/{name}", auto_move, lambda g=game: (clone(g),)
+    yield "headless_game/seed1", lambda: play_game(seed=1), None
+
+
+def run(filter_text=None, min_time=0.5):
+    results = {}
+    for name, fn, setup in cases():
+        if filter_text and filter_text not in name:
+            continue
+        results[name] = stats(measure(fn, setup, min_time if not name.startswith("headless") else 0))
+        r = results[name]
+        print(f"{name:<28} {r['ops_per_sec']:>12.1f} ops/s  p50 {r['p50_us']:>10.1f} µs  "
+              f"p90 {r['p90_us']:>10.1f} µs  p99 {r['p99_us']:>10.1f} µs")
+    return results
+
+
+def compare(baseline, current, threshold):
+    # Regression = Median mehr als threshold Prozent langsamer als in der Basis
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        change = (now["p50_us"] - before["p50_us"]) / before["p50_us"] * 100
+        flag = "REGRESSION" if change > threshold else ("schneller" if change < -threshold else "")
+        print(f"{name:<28} {before['p50_us']:>10.1f} -> {now['p50_us']:>10.1f} µs  {change:>+7.1f}%  {flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für Pfadsuche und auto_move")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="Messen und ausgeben")
+    run_parser.add_argument("--save", default=None, help="Ergebnisse als Basis-Datei (JSON) speichern")
+    compare_parser = sub.add_parser("compare", help="Erneut messen und gegen eine Basis-Datei vergleichen")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Regressionsschwelle in Prozent")
+    for p in (run_parser, compare_parser):
+        p.add_argument("--filter", default=None, help="Nur Fälle, deren Name diesen Text enthält")
+        p.add_argument("--min-time", type=float, default=0.5, help="Messdauer pro Fall in Sekunden")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.min_time)
+    if args.command == "run":
+        if args.save:
+            with open(args.save, "w") as file:
+                json.dump({"python": sys.version, "platform": platform.platform(), "results": results}, file, indent=2)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(baseline, results, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} Regression(en) über {args.threshold:.0f}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
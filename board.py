@@ -0,0 +1,155 @@
+# board.py
+# Schlangenkörper als deque plus Belegungsraster (bytearray, ein Byte pro Feld).
+# Kopf setzen, Schwanz entfernen und "ist belegt?" kosten damit O(1) statt O(Länge).
+# Positionen sind Feldkoordinaten (Spalte, Zeile); die Pixelgröße kennt nur der Renderer.
+from array import array
+import random
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from constants import ROWS, COLS
+
+# Zobrist-Schlüssel pro Feld und Rolle: ZOBRIST_BODY für belegte Felder (Board.zobrist), die übrigen falten
+# Kopf, Schwanz und Futter in einen Zustandsschlüssel (siehe transposition.py)
+ZOBRIST_BODY, ZOBRIST_HEAD, ZOBRIST_TAIL, ZOBRIST_FOOD = range(4)
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(cells):
+    # 64-Bit-Zufallszahlen, fest geseedet: gleiche Brettgröße, gleiche Schlüssel (auch über Prozesse hinweg).
+    # keys[rolle * cells + feld]
+    keys = array('Q')
+    keys.frombytes(random.Random(cells).randbytes(8 * 4 * cells))
+    return keys
+
+
+
+class Board:
+    def __init__(self, cols=COLS, rows=ROWS, segments=()):
+        self.cols = cols
+        self.rows = rows
+        self.body = deque()  # body[0] ist der Kopf, body[-1] der Schwanz
+        self.grid = bytearray(cols * rows)
+        # stamp[i] = Nummer des push_head, der Feld i belegt hat; daraus folgt, wann ein Segment frei wird
+        self.stamp = array('l', [0]) * (cols * rows)
+        self.pushes = 0
+        # Index der freien Felder: free[:free_count] sind frei, free_pos[i] ist die Position von Feld i in free.
+        # Belegen und Freigeben tauschen nur zwei Einträge, eine Zufallsauswahl kostet damit O(1).
+        self.free = array('l', range(cols * rows))
+        self.free_pos = array('l', range(cols * rows))
+        self.free_count = cols * rows
+        # Zobrist-Hash der Belegung: XOR der Schlüssel aller belegten Felder, von push_head/pop_tail nachgeführt
+        self.keys = zobrist_keys(cols * rows)
+        self.zobrist = 0
+        for pos in reversed(segments):
+            self.push_head(pos)
+
+    def index(self, pos):
+        return pos[1] * self.cols + pos[0]
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.cols and 0 <= pos[1] < self.rows
+
+    def is_occupied(self, pos):
+        return self.in_bounds(pos) and self.grid[self.index(pos)] != 0
+
+    def is_free(self, pos):
+        # Innerhalb des Spielfelds und nicht vom Körper belegt
+        return self.in_bounds(pos) and self.grid[self.index(pos)] == 0
+
+    def push_head(self, pos):
+        i = self.index(pos)
+        self.body.appendleft(pos)
+        self.grid[i] = 1
+        self.pushes += 1
+        self.stamp[i] = self.pushes
+        self.zobrist ^= self.keys[i]
+        self.free_count -= 1
+        self._swap_free(i, self.free_count)
+
+    def pop_tail(self):
+        pos = self.body.pop()
+        i = self.index(pos)
+        self.grid[i] = 0
+        self.zobrist ^= self.keys[i]
+        self._swap_free(i, self.free_count)
+        self.free_count += 1
+        return pos
+
+    def _swap_free(self, i, slot):
+        # Feld i an Position slot im Frei-Index tauschen
+        other = self.free[slot]
+        old = self.free_pos[i]
+        self.free[old] = other
+        self.free_pos[other] = old
+        self.free[slot] = i
+        self.free_pos[i] = slot
+
+    def cell_pos(self, i):
+        return (i % self.cols, i // self.cols)
+
+    def random_free(self, rng):
+        # Gleichverteilt ein freies Feld ziehen (None, wenn das Brett voll ist). Das Ergebnis hängt nur von
+        # der Belegung und rng ab, nicht von der Reihenfolge im Frei-Index; ein aus Körper und rng-Zustand
+        # wiederhergestelltes Brett zieht daher dasselbe Futter (replay.py).
+        if not self.free_count:
+            return None
+        grid, cells = self.grid, self.cols * self.rows
+        for _ in range(32):
+            i = rng.randrange(cells)
+            if not grid[i]:
+                return self.cell_pos(i)
+        # Fast volles Brett: unter den freien Feldern in fester Reihenfolge wählen
+        free = sorted(self.free[:self.free_count])
+        return self.cell_pos(free[rng.randrange(len(free))])
+
+    @property
+    def head(self):
+        return self.body[0]
+
+    @property
+    def tail(self):
+        return self.body[-1]
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.cols = self.cols
+        board.rows = self.rows
+        board.body = self.body.copy()
+        board.grid = self.grid[:]
+        board.stamp = self.stamp[:]
+        board.pushes = self.pushes
+        board.free = self.free[:]
+        board.free_pos = self.free_pos[:]
+        board.free_count = self.free_count
+        board.keys = self.keys
+        board.zobrist = self.zobrist
+        return board
+
+    def free_after(self, i):
+        # Ab dem wievielten Zug (1 = nächster Zug) Feld i wieder betreten werden darf, wenn nichts gefressen wird.
+        # Der Schwanz verlässt sein Feld erst nach dem Kollisionstest, daher +2 statt +1.
+        if not self.grid[i]:
+            return 0
+        return self.stamp[i] - self.stamp[self.index(self.body[-1])] + 2
+
+    def __contains__(self, pos):
+        return self.is_occupied(pos)
+
+    def __len__(self):
+        return len(self.body)
+
+    def __iter__(self):
+        return iter(self.body)
+
+    def __getitem__(self, key):
+        # Listenartiger Zugriff, u.a. für snake[0], snake[-1] und snake[:5] in Log-Ausgaben
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self.body))
+            if step == 1 and start == 0:
+                return list(islice(self.body, stop))
+            return list(self.body)[key]
+        return self.body[key]
+
+    def __repr__(self):
+        return f"Board({list(self.body)!r})"
@@ -0,0 +1,185 @@
+# core.py
+# Spiellogik ohne pygame: Brett, Bewegung, Futter und Punkte.
+# Wird von game.py (Fenster) und headless.py (Batch-Läufe) gemeinsam genutzt.
+# Alle Positionen sind Feldkoordinaten (Spalte, Zeile); die Brettgröße ist frei wählbar.
+import random
+import time
+from constants import *
+from auto_move import auto_move
+from board import Board
+from reachability import Reachability, default_limit
+from hamilton import get_cycle
+from transposition import DecisionCache
+from log import get_logger
+
+logger = get_logger("game")
+
+
+class SnakeCore:
+    def __init__(self, seed=None, strategy=None, cols=COLS, rows=ROWS):
+        # Eigener Zufallsgenerator pro Spiel, damit Partien mit gleichem Seed gleich ablaufen.
+        # Ohne Seed wird einer gezogen und gemerkt, damit auch solche Partien reproduzierbar bleiben.
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        # Ab dieser Länge folgt auto_move dem Hamilton-Zyklus (81 auf dem Standardbrett, auf kleineren anteilig).
+        # Sind beide Seiten ungerade, gibt es keinen Zyklus: dann jagt auto_move bis zum Schluss Futter.
+        self.strategic_length = min(81, max(4, self.cells * 81 // 600))
+        if not get_cycle(cols, rows).is_cycle:
+            self.strategic_length = self.cells
+        self.rng = random.Random(self.seed)
+        self.strategy = strategy or auto_move  # Funktion(game), die einen Zug ausführt
+        self.visited = set()
+        self.base_speed = 20  # Für 240 cm/min bei GRID_SIZE = 20
+        self.current_speed = self.base_speed
+        self.path_fail_count = 0
+        self.realtime = False  # True im Fenster: der Planer bekommt zusätzlich eine Frist pro Tick
+        self.reset_game()
+
+    def reset_game(self):
+        self.running = True
+        self.score = 0
+        self.cycle = get_cycle(self.cols, self.rows)
+        start = self.cycle.pos(self.cycle.order[0])
+        self.cycle_ordered = True
+        self.snake = Board(self.cols, self.rows, [start])
+        self.food = self.spawn_food()
+        self.direction = RIGHT
+        self.game_over = False
+        self.death_cause = None
+        self.path_index = 0
+        self.max_length = 1
+        self.moves = 0
+        self.auto_mode = True  # Auto-Modus als Standard
+        self.current_speed = self.base_speed
+        self.path_fail_count = 0
+        self.visited = set([start])
+        self.start_time = time.perf_counter()
+        self.recorder = None  # replay.Recorder der laufenden Partie, falls aufgezeichnet wird
+        self.cache = DecisionCache()  # pro Partie, damit Partien mit gleichem Seed gleich ablaufen
+        logger.info("Spiel zurückgesetzt")
+        logger.info("Startposition: %s, Futter: %s", self.snake[0], self.food)
+
+    def decision_view(self, cls, **state):
+        # Sicht auf diesen Spielstand für Strategien, die nur entscheiden sollen (cls: Unterklasse von DecisionView).
+        # Übernimmt den ganzen Zustand ohne __init__ (kein reset_game, kein neues Futter), damit neue Attribute
+        # nie fehlen; Körper und Zufallsgenerator werden kopiert, sofern state sie nicht vorgibt.
+        view = cls.__new__(cls)
+        view.__dict__.update(self.__dict__)
+        view.visited = set()
+        view.recorder = None
+        view.decision = None  # neues Kopffeld
+        view.cause = None  # oder Grund für das Spielende
+        view.__dict__.update(state)
+        if "snake" not in state:
+            view.snake = self.snake.copy()
+        if "rng" not in state:
+            view.rng = random.Random()
+            view.rng.setstate(self.rng.getstate())
+        return view
+
+    def spawn_food(self):
+        # Zufälliges freies Feld aus dem Frei-Index des Boards (O(1) pro Zug). Erreichbarkeit prüft
+        # eine Komponenten-Beschriftung statt A* pro Versuch; auf großen Brettern begrenzt, eine Fläche
+        # ab reach.limit Feldern gilt dann als erreichbar.
+        if len(self.snake) < 2:
+            # Ein einzelnes Segment kann keine Fläche abschneiden, jedes freie Feld ist erreichbar
+            return self.snake.random_free(self.rng)
+        x, y = self.snake[0]
+        head_neighbors = ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+        reach = Reachability(self.snake, free_tail=False, limit=default_limit(self.snake))
+        food_pos = None
+        for _ in range(20):
+            food_pos = self.snake.random_free(self.rng)
+            if food_pos is None:
+                return None
+            label = reach.label(food_pos)
+            if reach.limit is not None and reach.sizes[label] >= reach.limit:
+                return food_pos
+            if any(reach.label(pos) == label for pos in head_neighbors):
+                return food_pos
+        # Kein erreichbares Feld gezogen: irgendein freies Feld ist besser als keins
+        return food_pos
+
+    def get_coverage(self):
+        return (self.max_length / self.cells) * 100
+
+    def record(self):
+        # Kennzahlen der Partie, wie sie das Spielarchiv (records.py) speichert
+        return {
+            "seed": self.seed,
+            "score": self.score,
+            "coverage": self.get_coverage(),
+            "length": len(self.snake),
+            "moves": self.moves,
+            "duration": time.perf_counter() - self.start_time,
+            "death_cause": self.death_cause or "max_moves",
+        }
+
+    def end_game(self, cause):
+        # Einziger Ausgang in den Game-Over-Zustand; Unterklassen hängen sich über on_game_over ein.
+        # cause: "wall", "self", "dead_end", "collision", "board_full" oder "max_moves"
+        if self.game_over:
+            return
+        self.game_over = True
+        self.death_cause = cause
+        self.on_game_over()
+
+    def on_game_over(self):
+        pass
+
+    def move(self):
+        if self.game_over:
+            return
+        if self.auto_mode:
+            self.strategy(self)
+        else:
+            self.manual_move()
+
+    def advance(self, new_head):
+        # Setzt den Kopf auf new_head und frisst ggf. Futter; gibt True zurück, wenn gefressen wurde
+        food = self.food
+        self.snake.push_head(new_head)
+        self.visited.add(new_head)
+        self.moves += 1
+        ate = new_head == food
+        if ate:
+            self.score += 1
+            self.food = self.spawn_food()
+            self.max_length = max(self.max_length, len(self.snake))
+        else:
+            self.snake.pop_tail()
+        if self.recorder is not None:
+            self.recorder.record(self, new_head, food)
+        return ate
+
+    def manual_move(self):
+        if self.game_over:
+            return
+
+        head_x, head_y = self.snake[0]
+        dx, dy = self.direction
+        new_head = (head_x + dx, head_y + dy)
+
+        if not (0 <= new_head[0] < self.cols and 0 <= new_head[1] < self.rows):
+            logger.info("Manuelle Kollision mit der Wand bei %s", new_head)
+            self.end_game("wall")
+            return
+        if new_head in self.snake:
+            logger.info("Manuelle Kollision bei %s, Schlange=%s...", new_head, self.snake[:5])
+            self.end_game("self")
+            return
+
+        self.advance(new_head)
+
+
+class DecisionView(SnakeCore):
+    # Entstehen per SnakeCore.decision_view(). advance() und end_game() führen nichts aus, sondern merken sich
+    # nur die Entscheidung; ausgeführt wird sie vom Besitzer (pipeline.PlannerThread, arena.Arena).
+    def advance(self, new_head):
+        self.decision = new_head
+        return False
+
+    def end_game(self, cause):
+        self.cause = cause
@@ -0,0 +1,130 @@
+# env.py
+# reset/step-Schnittstelle im Stil von Gym um SnakeCore, damit gelernte Politiken neben auto_move laufen können.
+# Die Beobachtung ist ein Dict aus NumPy-Views ohne Kopie pro Zug:
+#   occupancy  (rows, cols) uint8 - direkt über Board.grid, ändert sich mit dem Spiel
+#   head, food (rows, cols) uint8 - eigene Ebenen, pro Zug werden nur die betroffenen Felder umgesetzt
+#   direction  (4,) uint8         - One-Hot über ACTIONS
+# Die Arrays werden weiterverwendet; wer einen Zustand aufheben will, muss ihn selbst kopieren.
+# Läuft ohne pygame.
+#
+# Aufruf (Durchsatz mit Zufallspolitik messen): python env.py --steps 100000
+import argparse
+import time
+import numpy as np
+from constants import COLS, ROWS
+from core import SnakeCore
+from batch_env import ACTIONS
+
+
+class SnakeEnv:
+    def __init__(self, cols=COLS, rows=ROWS, seed=None, max_moves=None,
+                 reward_food=1.0, reward_death=-1.0, reward_step=0.0):
+        self.cols = cols
+        self.rows = rows
+        self.max_moves = max_moves
+        self.reward_food = reward_food
+        self.reward_death = reward_death
+        self.reward_step = reward_step
+        self.head_plane = np.zeros((rows, cols), dtype=np.uint8)
+        self.food_plane = np.zeros((rows, cols), dtype=np.uint8)
+        self.direction_onehot = np.zeros(len(ACTIONS), dtype=np.uint8)
+        self.game = SnakeCore(seed, cols=cols, rows=rows)
+        self.game.auto_mode = False
+        self.observation = None
+        self._bind()
+
+    def _bind(self):
+        # Views neu anlegen; nötig nur, wenn reset_game ein neues Board erzeugt hat
+        game = self.game
+        self.occupancy = np.frombuffer(game.snake.grid, dtype=np.uint8).reshape(self.rows, self.cols)
+        self.head_plane.fill(0)
+        self.food_plane.fill(0)
+        self.head = game.snake[0]
+        self.head_plane[self.head[1], self.head[0]] = 1
+        self.food = game.food
+        if self.food is not None:
+            self.food_plane[self.food[1], self.food[0]] = 1
+        self.direction_onehot.fill(0)
+        self.direction_onehot[ACTIONS.index(game.direction)] = 1
+        self.observation = {"occupancy": self.occupancy, "head": self.head_plane,
+                            "food": self.food_plane, "direction": self.direction_onehot}
+
+    def reset(self, seed=None):
+        # Neue Partie; mit seed wird der Zufallsgenerator des Spiels neu gesetzt
+        game = self.game
+        if seed is not None:
+            game.seed = seed
+            game.rng.seed(seed)
+        game.reset_game()
+        game.auto_mode = False
+        self._bind()
+        return self.observation, self.info()
+
+    def step(self, action):
+        # action: Index in ACTIONS. Gibt (observation, reward, terminated, truncated, info) zurück.
+        game = self.game
+        score = game.score
+        direction = ACTIONS[action]
+        if direction != game.direction:
+            self.direction_onehot[ACTIONS.index(game.direction)] = 0
+            self.direction_onehot[action] = 1
+            game.direction = direction
+        game.manual_move()
+
+        head = game.snake[0]
+        if head != self.head:
+            self.head_plane[self.head[1], self.head[0]] = 0
+            self.head_plane[head[1], head[0]] = 1
+            self.head = head
+        if game.food != self.food:
+            if self.food is not None:
+                self.food_plane[self.food[1], self.food[0]] = 0
+            if game.food is not None:
+                self.food_plane[game.food[1], game.food[0]] = 1
+            self.food = game.food
+
+        terminated = game.game_over
+        if not terminated and len(game.snake) >= game.cells:
+            game.end_game("board_full")
+            terminated = True
+        if game.score > score:
+            reward = self.reward_food
+        elif terminated and game.death_cause != "board_full":
+            reward = self.reward_death
+        else:
+            reward = self.reward_step
+        truncated = not terminated and self.max_moves is not None and game.moves >= self.max_moves
+        return self.observation, reward, terminated, truncated, self.info()
+
+    def info(self):
+        game = self.game
+        return {"score": game.score, "length": len(game.snake), "moves": game.moves,
+                "coverage": game.get_coverage(), "death_cause": game.death_cause}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SnakeEnv mit Zufallspolitik durchlaufen lassen")
+    parser.add_argument("--steps", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    env = SnakeEnv(seed=args.seed)
+    rng = np.random.default_rng(args.seed)
+    turn = ((0, 2, 3), (1, 2, 3), (2, 0, 1), (3, 0, 1))  # Richtung behalten oder abbiegen, nie umkehren
+    actions = rng.integers(0, 3, args.steps)
+    direction = ACTIONS.index(env.game.direction)
+    episodes = 0
+    start = time.perf_counter()
+    for i in range(args.steps):
+        direction = turn[direction][actions[i]]
+        observation, reward, terminated, truncated, info = env.step(direction)
+        if terminated or truncated:
+            episodes += 1
+            env.reset()
+            direction = ACTIONS.index(env.game.direction)
+    elapsed = time.perf_counter() - start
+    print(f"{args.steps} Züge in {elapsed:.2f} s: {args.steps / elapsed:,.0f} Züge/s, {episodes} Partien")
+
+
+if __name__ == "__main__":
+    main()
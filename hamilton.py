@@ -0,0 +1,113 @@
+# hamilton.py
+# Vorberechneter Hamilton-Zyklus pro Brettgröße: Reihenfolge, Position->Index und Nachfolger als Arrays.
+# Jede Routen-Abfrage ist damit O(1) statt eines Laufs über die ganze Route.
+# Die Arrays kommen aus tables.py (vorberechnet per mmap eingeblendet oder beim ersten Zugriff berechnet).
+from functools import cached_property, lru_cache
+from tables import get_tables
+
+
+class HamiltonCycle:
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        tables = get_tables(cols, rows)
+        self.order = tables.order
+        self.index_of = tables.index_of
+        self.next_cell = tables.next_cell
+        first, last = self.order[0], self.order[-1]
+        self.is_cycle = abs(first % cols - last % cols) + abs(first // cols - last // cols) == 1
+
+    @cached_property
+    def route(self):
+        # Zyklus als Liste von Positionen; erst bei Bedarf gebaut, bei großen Brettern braucht sie viel Speicher
+        return [self.pos(cell) for cell in self.order]
+
+    def pos(self, cell):
+        return (cell % self.cols, cell // self.cols)
+
+    def cell(self, pos):
+        return pos[1] * self.cols + pos[0]
+
+    def index(self, pos):
+        return self.index_of[self.cell(pos)]
+
+    def next_point(self, pos):
+        return self.pos(self.next_cell[self.cell(pos)])
+
+    def distance(self, from_pos, to_pos):
+        # Schritte entlang des Zyklus von from_pos bis to_pos
+        return (self.index(to_pos) - self.index(from_pos)) % self.size
+
+    def is_ordered(self, board):
+        # True, wenn der Körper vom Schwanz zum Kopf in Zyklusrichtung ohne Überrundung liegt.
+        # Nur dann garantiert das Folgen des Zyklus (auch mit Abkürzungen) ein Durchspielen.
+        index_of, size = self.index_of, self.size
+        previous = None
+        total = 0
+        for pos in board:
+            i = index_of[board.index(pos)]
+            if previous is not None:
+                total += (previous - i) % size
+            previous = i
+        span = (self.index(board[0]) - self.index(board[-1])) % size
+        return total == span
+
+    def is_clear_ahead(self, board, food):
+        # True, wenn der Kopf die nächsten len(board) Felder des Zyklus der Reihe nach betreten kann, weil jedes
+        # rechtzeitig frei wird (Board.free_after; nach dem Fressen rückt der Schwanz einen Zug später nach).
+        # Danach liegt der Körper in Zyklusreihenfolge; bis dahin ist jeder Zug entlang des Zyklus sicher.
+        if not self.is_cycle:
+            return False
+        next_cell = self.next_cell
+        cell = board.index(board[0])
+        food_cell = board.index(food) if food is not None else -1
+        lag = 0
+        for step in range(1, len(board) + 1):
+            cell = next_cell[cell]
+            if board.free_after(cell) + lag > step:
+                return False
+            if cell == food_cell:
+                lag += 1
+        return True
+
+    def shortcut_step(self, board, food):
+        # Nächstes Feld entlang des Zyklus; darf Felder überspringen, solange der Körper danach noch
+        # geordnet ist und genug Abstand zum Schwanz bleibt. Setzt einen geordneten Körper voraus.
+        head = board[0]
+        next_pos = self.next_point(head)
+        if abs(next_pos[0] - head[0]) + abs(next_pos[1] - head[1]) != 1:
+            # Ende des Zickzack-Pfads (beide Seiten ungerade, kein Zyklus): kein Zug entlang der Route
+            next_pos = None
+        length = len(board)
+        if not self.is_cycle or length >= self.size // 2 or food is None:
+            return next_pos if next_pos and board.is_free(next_pos) else None
+
+        size = self.size
+        head_index = self.index(head)
+        tail_distance = (self.index(board[-1]) - head_index) % size if length > 1 else size
+        food_distance = (self.index(food) - head_index) % size
+        empty = size - length - 1
+        available = tail_distance - length - 3  # kleiner Puffer
+        if food_distance < tail_distance:
+            available -= 1
+            if (tail_distance - food_distance) * 4 > empty:
+                available -= 10
+        available = max(0, min(available, food_distance))
+
+        best, best_distance = None, -1
+        x, y = head
+        for pos in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if board.is_free(pos):
+                distance = (self.index(pos) - head_index) % size
+                if best_distance < distance <= available:
+                    best, best_distance = pos, distance
+        if best is not None:
+            return best
+        return next_pos if next_pos and board.is_free(next_pos) else None
+
+
+@lru_cache(maxsize=None)
+def get_cycle(cols, rows):
+    # Einmal pro Brettgröße bauen; alle Spiele teilen sich die Tabellen (nur lesend verwenden)
+    return HamiltonCycle(cols, rows)
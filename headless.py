@@ -0,0 +1,81 @@
+# headless.py
+# Spielt Auto-Solve-Partien ohne Fenster und ohne Bremse durch clock.tick.
+# Aufruf: python headless.py --games 10 --seed 1
+import argparse
+import time
+import log
+import profiler
+from constants import COLS, ROWS
+from core import SnakeCore
+from records import RecordStore
+
+
+def play_game(max_moves=200000, seed=None, strategy=None, cols=COLS, rows=ROWS):
+    # Spielt eine Partie bis Game Over (oder max_moves) und liefert die Kennzahlen
+    start = time.perf_counter()
+    game = SnakeCore(seed, strategy, cols, rows)
+    while not game.game_over and game.moves < max_moves:
+        game.move()
+    result = game.record()
+    result["duration"] = duration = time.perf_counter() - start
+    result["moves_per_sec"] = game.moves / duration if duration > 0 else 0.0
+    result["cache"] = game.cache.stats()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snake ohne Fenster so schnell wie möglich spielen")
+    parser.add_argument("--games", type=int, default=1, help="Anzahl der Partien")
+    parser.add_argument("--seed", type=int, default=None, help="Seed der ersten Partie, die weiteren zählen hoch")
+    parser.add_argument("--max-moves", type=int, default=200000, help="Abbruch nach so vielen Zügen pro Partie")
+    parser.add_argument("--cols", type=int, default=COLS, help="Spalten des Bretts")
+    parser.add_argument("--rows", type=int, default=ROWS, help="Zeilen des Bretts")
+    parser.add_argument("--verbose", action="store_true", help="Debug-Ausgaben von auto_move anzeigen")
+    parser.add_argument("--log-file", default=None, help="Debug-Trace als JSON-Lines in diese Datei schreiben")
+    parser.add_argument("--store", default=None, help="Ergebnisse an dieses Spielarchiv (SQLite) anhängen")
+    parser.add_argument("--profile", default=None, help="Phasen-Profil aller Ticks als .json oder .csv speichern")
+    parser.add_argument("--cache-stats", action="store_true", help="Treffer des Entscheidungs-Caches anzeigen")
+    args = parser.parse_args(argv)
+
+    sink = None
+    if args.verbose:
+        log.set_level(log.DEBUG)
+    if args.log_file:
+        log.set_level(log.DEBUG)
+        log.set_console(args.verbose)
+        sink = log.add_jsonl_sink(args.log_file)
+
+    prof = profiler.enable() if args.profile else None
+    results = []
+    for i in range(args.games):
+        result = play_game(args.max_moves, None if args.seed is None else args.seed + i, cols=args.cols, rows=args.rows)
+        results.append(result)
+        print(f"Partie {i + 1}: Score {result['score']}, Deckung {result['coverage']:.1f}%, "
+              f"Züge {result['moves']}, {result['moves_per_sec']:.0f} Züge/s, "
+              f"Ende: {result['death_cause']}")
+
+    total_moves = sum(r["moves"] for r in results)
+    total_time = sum(r["duration"] for r in results)
+    print(f"Gesamt: {len(results)} Partien, "
+          f"Durchschn. Score {sum(r['score'] for r in results) / len(results):.1f}, "
+          f"Durchschn. Deckung {sum(r['coverage'] for r in results) / len(results):.1f}%, "
+          f"{total_moves / total_time if total_time > 0 else 0.0:.0f} Züge/s")
+    if args.cache_stats:
+        hits = sum(r["cache"]["hits"] for r in results)
+        misses = sum(r["cache"]["misses"] for r in results)
+        rate = 100 * hits / (hits + misses) if hits + misses else 0.0
+        print(f"Cache Pfade: {hits} Treffer, {misses} Fehlschläge ({rate:.1f}%)")
+    if args.store:
+        store = RecordStore(args.store)
+        store.append_many(results)
+        store.close()
+    if prof:
+        profiler.disable()
+        prof.export(args.profile)
+        print("Profil: " + " | ".join(prof.overlay_lines()))
+    if sink:
+        log.remove_sink(sink)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# log.py
+# Gestuftes Logging für auto_move, pathfinding und das Spiel, aufgesetzt auf das logging-Modul.
+# Meldungen werden im %-Stil übergeben und erst formatiert, wenn ein Handler sie wirklich ausgibt.
+# Heiße Pfade fragen vorher einmal log.isEnabledFor(DEBUG) ab und sparen sich dann sogar den Aufruf.
+#
+# Stufe per Umgebungsvariable: SNAKE_LOG=debug|info|warning (Standard: warning)
+import json
+import logging
+import os
+import sys
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+
+_root = logging.getLogger("snake")
+_root.propagate = False
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+_root.addHandler(_console)
+_root.setLevel(os.environ.get("SNAKE_LOG", "warning").upper())
+
+
+def get_logger(name):
+    return _root.getChild(name)
+
+
+def set_level(level):
+    # level als Zahl (log.DEBUG) oder Name ("debug")
+    _root.setLevel(level.upper() if isinstance(level, str) else level)
+
+
+def set_console(enabled):
+    # Konsolenausgabe an- oder abschalten, z. B. wenn nur in eine Datei geschrieben werden soll
+    if enabled and _console not in _root.handlers:
+        _root.addHandler(_console)
+    elif not enabled:
+        _root.removeHandler(_console)
+
+
+class JsonLinesHandler(logging.Handler):
+    # Schreibt jede Meldung als eine JSON-Zeile. Zeilen werden gesammelt und blockweise geschrieben,
+    # damit Debug-Traces in großer Menge mitgeschnitten werden können, ohne die Schleife auszubremsen.
+    def __init__(self, path, buffer_size=1000):
+        super().__init__()
+        self.file = open(path, "a", encoding="utf-8")
+        self.buffer_size = buffer_size
+        self.lines = []
+
+    def emit(self, record):
+        entry = {
+            "t": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.msg,
+            "args": [a if isinstance(a, (int, float, str, bool, type(None))) else repr(a) for a in record.args or ()],
+        }
+        data = getattr(record, "data", None)
+        if data is not None:
+            entry["data"] = data
+        self.lines.append(json.dumps(entry, ensure_ascii=False))
+        if len(self.lines) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.file.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        super().close()
+
+
+def add_jsonl_sink(path, buffer_size=1000):
+    # Zusätzlicher JSON-Lines-Mitschnitt; mit remove_sink wieder abhängen (schreibt den Rest des Puffers)
+    handler = JsonLinesHandler(path, buffer_size)
+    _root.addHandler(handler)
+    return handler
+
+
+def remove_sink(handler):
+    _root.removeHandler(handler)
+    handler.close()
@@ -1,8 +1,14 @@
 import pygame
 import sys
 from game import SnakeGame
+from scheduler import Scheduler
+from pipeline import PlannerThread
+from records import RecordStore, DEFAULT_PATH
+import profiler
 from constants import WIDTH, HEIGHT, GRID_SIZE  # Importiere Konstanten für Konsistenz
 
+RENDER_FPS = 60
+
 # Initialisiere Pygame
 pygame.init()
 
@@ -10,26 +16,57 @@ pygame.init()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Snake AI")
 
-# Erstelle das Spiel ohne Parameterübergabe
-game = SnakeGame()
+# Spielarchiv einmal öffnen; beim ersten Start Scores und Deckungen aus den alten Textdateien übernehmen
+records = RecordStore(DEFAULT_PATH)
+records.import_legacy()
+
+game = SnakeGame(records)
 
-# Spielschleife
+# Spielschleife: Simulation im festen Takt (game.current_speed Züge/s) oder im Turbo,
+# gezeichnet wird mit RENDER_FPS bzw. nur jedes K-te Frame.
+# Tasten: P = Pause, N = Einzelschritt, T = Turbo-Stufe, R = nur jedes K-te Frame zeichnen,
+# O = Phasen-Profiler mit Einblendung an/aus, B = Züge im Hintergrund-Thread berechnen an/aus.
+# Im normalen Takt rechnet ein Thread den nächsten Zug, während gezeichnet wird (pipeline.py);
+# Turbo und Einzelschritt rechnen wie bisher direkt in der Schleife.
+scheduler = Scheduler(RENDER_FPS)
+planner_thread = PlannerThread(game)
+background = True
 clock = pygame.time.Clock()
 while True:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            planner_thread.stop()
+            records.close()
             pygame.quit()
             sys.exit()
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE and game.game_over:
                 # Starte das Spiel neu, wenn Space gedrückt wird und Spiel vorbei ist
-                game = SnakeGame()
+                game = SnakeGame(records)
+                planner_thread.reset(game)
+            elif event.key == pygame.K_p:
+                scheduler.toggle_pause()
+            elif event.key == pygame.K_n:
+                scheduler.request_step()
+            elif event.key == pygame.K_t:
+                scheduler.cycle_turbo()
+            elif event.key == pygame.K_r:
+                scheduler.cycle_render_every()
+            elif event.key == pygame.K_b:
+                background = not background
+            elif event.key == pygame.K_o:
+                if profiler.active:
+                    profiler.disable()
+                else:
+                    profiler.enable()
+            pygame.display.set_caption(f"Snake AI - {scheduler.status()}" + ("" if background else ", ohne Hintergrund-Thread"))
 
-    if not game.game_over:
-        # Automatischer Zug, wenn das Spiel läuft
-        game.move()  # Nutze move, da es auto_move triggert
+    dt = clock.tick(RENDER_FPS) / 1000.0
+    # Automatische Züge, solange das Spiel läuft (move triggert auto_move)
+    pipelined = background and not scheduler.turbo and not scheduler.paused
+    scheduler.run(game, dt, planner_thread.move if pipelined else None)
 
-    # Zeichne das Spiel, auch wenn game_over, um den Stand zu sehen
-    game.draw(screen)  # Übergibt screen korrekt
-    pygame.display.flip()
-    clock.tick(game.current_speed)
\ No newline at end of file
+    # Zeichne das Spiel, auch wenn game_over, um den Stand zu sehen.
+    # Nur geänderte Bereiche aktualisieren; die Frame-Zeit bleibt auch bei langer Schlange flach
+    if scheduler.should_render():
+        pygame.display.update(game.draw(screen))
@@ -1,65 +1,115 @@
 # pathfinding.py
+import threading
+from array import array
 from heapq import heappush, heappop
 from utils import heuristic, get_neighbors
+from log import get_logger
+from hamilton import get_cycle
+from tables import get_tables
+import profiler
 
-def a_star(start, goal, width, height, snake):
-    open_set = []
-    heappush(open_set, (0, start))
-    came_from = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
+logger = get_logger("pathfinding")
 
+class _SearchBuffers:
+    # Flache Arrays pro Brettgröße, die über alle A*-Aufrufe wiederverwendet werden.
+    # Statt sie zu leeren, wird pro Aufruf eine neue Generation vergeben: ein Eintrag gilt
+    # nur, wenn seen[i] bzw. closed[i] der aktuellen Generation entspricht.
+    def __init__(self, cells):
+        self.g = array('l', [0]) * cells
+        self.parent = array('l', [0]) * cells
+        self.seen = array('l', [0]) * cells
+        self.closed = array('l', [0]) * cells
+        self.generation = 0
+
+# Pro Thread eigene Puffer: der Planer-Thread (pipeline.py) und der Hauptthread suchen gleichzeitig
+_local = threading.local()
+
+def _get_buffers(cells):
+    per_size = getattr(_local, "buffers", None)
+    if per_size is None:
+        per_size = _local.buffers = {}
+    buffers = per_size.get(cells)
+    if buffers is None:
+        buffers = per_size[cells] = _SearchBuffers(cells)
+    return buffers
+
+def a_star(start, goal, cols, rows, snake, time_aware=True, max_expansions=None):
+    # A* auf Feldindizes. snake ist ein Board; mit time_aware gilt ein Körpersegment als frei,
+    # sobald der Schwanz bis zur Ankunft daran vorbeigezogen ist (Board.free_after).
+    # max_expansions begrenzt die Arbeit auf großen Brettern; wird es erreicht, gilt das Ziel als unerreichbar.
+    if profiler.active:
+        profiler.active.count("a_star")
+    if not (0 <= goal[0] < cols and 0 <= goal[1] < rows):
+        logger.debug("A* Pfad nicht gefunden")
+        return None
+    s = start[1] * cols + start[0]
+    t = goal[1] * cols + goal[0]
+    if s == t:
+        return [start]
+    tx, ty = t % cols, t // cols
+
+    buffers = _get_buffers(cols * rows)
+    buffers.generation += 1
+    generation = buffers.generation
+    g_score, parent, seen, closed = buffers.g, buffers.parent, buffers.seen, buffers.closed
+
+    grid = snake.grid
+    stamp = snake.stamp
+    adjacency = get_tables(cols, rows).adjacency  # 4 Nachbarn pro Feld, -1 außerhalb
+    # Ein Segment mit Stempel p darf ab Zug p - tail_stamp + 2 betreten werden
+    offset = 2 - stamp[snake.index(snake[-1])] if time_aware and len(snake) else None
+
+    g_score[s] = 0
+    seen[s] = generation
+    open_set = [(abs(s % cols - tx) + abs(s // cols - ty), 0, s)]
+    budget = max_expansions if max_expansions is not None else -1
     while open_set:
-        current = heappop(open_set)[1]
-        if current == goal:
+        current = heappop(open_set)[2]
+        if closed[current] == generation:
+            continue
+        closed[current] = generation
+        if budget == 0:
+            logger.debug("A* Suchgrenze erreicht")
+            return None
+        budget -= 1
+        if current == t:
             path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
+            while current != s:
+                path.append((current % cols, current // cols))
+                current = parent[current]
             path.append(start)
             return path[::-1]
 
-        for neighbor in get_neighbors(current, width, height, snake):
-            tentative_g_score = g_score[current] + 20  # GRID_SIZE
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                heappush(open_set, (f_score[neighbor], neighbor))
-    print("A* Pfad nicht gefunden")
+        next_g = g_score[current] + 1
+        first = 4 * current
+        for neighbor in adjacency[first:first + 4]:
+            if neighbor < 0 or closed[neighbor] == generation:
+                continue
+            if grid[neighbor] and (offset is None or next_g < stamp[neighbor] + offset):
+                continue
+            if seen[neighbor] != generation or next_g < g_score[neighbor]:
+                seen[neighbor] = generation
+                g_score[neighbor] = next_g
+                parent[neighbor] = current
+                h = abs(neighbor % cols - tx) + abs(neighbor // cols - ty)
+                heappush(open_set, (next_g + h, -next_g, neighbor))
+    logger.debug("A* Pfad nicht gefunden")
     return None
 
-def follow_tail(head, snake, width, height):
+def follow_tail(head, snake, cols, rows):
     tail = snake[-1]
     best_neighbor = None
     min_dist = float('inf')
-    neighbors = get_neighbors(head, width, height, snake)
+    neighbors = get_neighbors(head, cols, rows, snake)
     for neighbor in neighbors:
-        if neighbor not in snake[1:-1]:
+        if neighbor not in snake or neighbor == head or neighbor == tail:
             dist = heuristic(neighbor, tail)
             if dist < min_dist:
                 min_dist = dist
                 best_neighbor = neighbor
-    print(f"Follow_tail: head={head}, tail={tail}, best_neighbor={best_neighbor}, neighbors={neighbors}")
+    logger.debug("Follow_tail: head=%s, tail=%s, best_neighbor=%s, neighbors=%s", head, tail, best_neighbor, neighbors)
     return best_neighbor
 
-def generate_snake_path(width, height, rows, cols):
-    path = []
-    for row in range(rows):
-        if row % 2 == 0:
-            for col in range(cols):
-                path.append((col * 20, row * 20))  # GRID_SIZE
-        else:
-            for col in reversed(range(cols)):
-                path.append((col * 20, row * 20))
-    return path
-
-def find_closest_path_index(head, path):
-    min_dist = float('inf')
-    closest_index = 0
-    for i, pos in enumerate(path):
-        dist = heuristic(head, pos)
-        if dist < min_dist:
-            min_dist = dist
-            closest_index = i
-    return closest_index
\ No newline at end of file
+def generate_snake_path(cols, rows):
+    # Route des vorberechneten Hamilton-Zyklus für diese Brettgröße (siehe hamilton.py)
+    return list(get_cycle(cols, rows).route)
@@ -0,0 +1,157 @@
+# pipeline.py
+# Zugberechnung in einem Hintergrund-Thread, damit das Fenster bei langsamen Ticks nicht stockt.
+# Nach jedem Zug bekommt der Thread eine Kopie des Spielstands (Snapshot) und berechnet daraus den nächsten
+# Zug, während der Hauptthread zeichnet und Ereignisse verarbeitet. Ist der Zug fällig, wird das Ergebnis
+# übernommen; rechnet der Thread dann noch, gilt die Frist als verpasst und es wird ein sicherer
+# Ersatzzug gemacht (Nachfolger im Hamilton-Zyklus, sonst der Nachbar mit der größten freien Fläche).
+#
+# Die Strategie läuft auf einem _Snapshot (core.DecisionView): advance() und end_game() führen dort nichts
+# aus, sondern merken sich nur die Entscheidung. Futter, Punkte und Spielende setzt allein der Hauptthread,
+# mit dem eigenen Zufallsgenerator; ohne verpasste Fristen verläuft eine Partie daher wie ohne Thread.
+# Snapshots benutzen einen eigenen DecisionCache der Pipeline, damit Thread und direkte Züge (Turbo,
+# Einzelschritt) nie gleichzeitig denselben Cache verändern.
+import queue
+import threading
+from auto_move import is_safe_move, find_next_path_point
+from core import DecisionView
+from transposition import DecisionCache
+from reachability import Reachability, default_limit
+from log import get_logger
+
+logger = get_logger("pipeline")
+
+# Zustand, den die Strategie fortschreibt; wird nach dem Zug aus dem Snapshot übernommen
+STRATEGY_STATE = ("current_speed", "path_fail_count", "cycle_ordered", "path_index")
+
+
+class _Snapshot(DecisionView):
+    @classmethod
+    def of(cls, game, cache):
+        snapshot = game.decision_view(cls, cache=cache)
+        snapshot.key = (game, game.moves)  # gehört zu diesem Spiel nach so vielen Zügen
+        return snapshot
+
+
+def fallback_move(game):
+    # Sicherer Zug ohne Suche: Nachfolger im Hamilton-Zyklus, sonst der Nachbar mit der größten Fläche
+    head = game.snake[0]
+    step = find_next_path_point(game, head)
+    if step and is_safe_move(step, game.snake, game.cols, game.rows, log=False):
+        return step
+    x, y = head
+    candidates = [pos for pos in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                  if is_safe_move(pos, game.snake, game.cols, game.rows, log=False)]
+    if not candidates:
+        return None
+    reach = Reachability(game.snake, limit=default_limit(game.snake))
+    return max(candidates, key=reach.area)
+
+
+class PlannerThread:
+    def __init__(self, game):
+        self.game = game
+        self.cache = DecisionCache()
+        self.requests = queue.Queue()
+        self.result = None  # letzter fertiger Snapshot
+        self.pending = None  # Schlüssel des Snapshots, an dem der Thread gerade rechnet
+        self.lock = threading.Lock()
+        self.stopped = False
+        self.missed = 0  # verpasste Fristen (Ersatzzüge)
+        self.planned = 0  # übernommene Züge aus dem Thread
+        self.thread = threading.Thread(target=self._run, name="snake-planner", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            snapshot = self.requests.get()
+            # Veraltete Aufträge überspringen, nur der neueste zählt
+            while snapshot is not None and not self.requests.empty():
+                snapshot = self.requests.get()
+            if snapshot is None:
+                return
+            try:
+                snapshot.strategy(snapshot)
+            except Exception:
+                logger.exception("Planer-Thread: Zug für Snapshot nach %s Zügen fehlgeschlagen", snapshot.moves)
+                snapshot.decision = snapshot.cause = None
+            with self.lock:
+                if self.pending == snapshot.key:
+                    self.result = snapshot
+                    self.pending = None
+
+    def reset(self, game):
+        # Neues Spiel (z.B. nach SPACE); Ergebnisse für das alte verfallen über den Schlüssel
+        self.game = game
+        self.cache = DecisionCache()
+        self.submit()
+
+    def submit(self):
+        # Aktuellen Spielstand an den Thread geben; ein noch laufender Auftrag wird damit hinfällig
+        game = self.game
+        if self.stopped or game.game_over or not game.auto_mode:
+            return
+        snapshot = _Snapshot.of(game, self.cache)
+        with self.lock:
+            self.pending = snapshot.key
+            self.result = None
+        self.requests.put(snapshot)
+
+    def _take(self):
+        # Fertiges Ergebnis für den aktuellen Stand, sonst None; zweites Ergebnis: rechnet der Thread noch daran?
+        key = (self.game, self.game.moves)
+        with self.lock:
+            result, self.result = self.result, None
+            busy = self.pending == key
+        if result is not None and result.key == key:
+            return result, False
+        return None, busy
+
+    def move(self):
+        # Fälligen Zug ausführen (für Scheduler.run) und den nächsten in Auftrag geben
+        game = self.game
+        if game.game_over:
+            return
+        if not game.auto_mode:
+            game.move()
+            return
+        snapshot, busy = self._take()
+        if snapshot is not None:
+            self.planned += 1
+            self._apply(snapshot)
+        elif busy:
+            # Frist verpasst: der Thread rechnet noch, der Zug ist aber jetzt fällig
+            self.missed += 1
+            new_head = fallback_move(game)
+            logger.info("Planer zu langsam, Ersatzzug %s", new_head)
+            if new_head is None:
+                game.end_game("dead_end")
+            else:
+                game.cycle_ordered = game.cycle_ordered and new_head == game.cycle.next_point(game.snake[0])
+                game.advance(new_head)
+        else:
+            # Kein Auftrag für diesen Stand (erster Zug, nach Turbo oder Einzelschritt): direkt rechnen
+            game.move()
+        self.submit()
+
+    def _apply(self, snapshot):
+        game = self.game
+        for name in STRATEGY_STATE:
+            setattr(game, name, getattr(snapshot, name))
+        if snapshot.food != game.food:
+            # Die Strategie hat neues Futter gezogen (z.B. nach wiederholt fehlgeschlagener Pfadsuche)
+            game.food = snapshot.food
+            game.rng.setstate(snapshot.rng.getstate())
+        if snapshot.decision is not None:
+            game.advance(snapshot.decision)
+        elif snapshot.cause is not None:
+            game.end_game(snapshot.cause)
+
+    def stop(self, timeout=1.0):
+        # Sauber beenden: Auftragsschlange schließen und auf den Thread warten
+        if self.stopped:
+            return
+        self.stopped = True
+        with self.lock:
+            self.pending = None
+        self.requests.put(None)
+        self.thread.join(timeout)
@@ -0,0 +1,220 @@
+# planner.py
+# Vorausschau für die Futterjagd in auto_move (Schritt 1).
+# Der Weg zum Futter wird mit einer virtuellen Schlange nachgespielt; danach muss der Kopf den eigenen
+# Schwanz noch erreichen, sonst sperrt sich die Schlange nach dem Fressen selbst ein.
+# Ist der Weg nicht sicher, sucht plan() per iterativer Vertiefung einen anderen Zug. Jede abgeschlossene
+# Tiefe liefert einen Zug; ist das Budget aufgebraucht, gilt das Ergebnis der tiefsten abgeschlossenen Suche.
+# Das Budget zählt Arbeit statt Zeit (besuchte Knoten plus die in den Blättern gefluteten Felder), damit gleiche
+# Seeds auf jedem Rechner gleich spielen; im Fenster (game.realtime) begrenzt zusätzlich eine Frist die Suche,
+# damit ein Tick nie länger als eine halbe Zugzeit dauert.
+#
+# Für den Weg zum Futter ist die virtuelle Schlange eine Liste plus Menge von Feldern. Schritt 1 läuft bis
+# strategic_length (höchstens 81 Segmente) und danach nur, bis der Körper in Zyklusreihenfolge liegt, daher
+# kostet das Nachspielen unabhängig von der Brettgröße wenig.
+# Die Suche führt Züge direkt auf dem Belegungsraster des Bretts aus und nimmt sie wieder zurück; eine Kopie
+# kostete pro Aufruf O(Felder), in der Arena (gemeinsames Raster) sogar pro Schlange. Nach plan() ist das Raster
+# wieder im Ausgangszustand.
+import time
+from collections import deque
+from itertools import islice
+import profiler
+
+MAX_DEPTH = 8
+PLAN_SHARE = 0.5  # Anteil der Zeit pro Zug (1 / current_speed), den die Suche höchstens verbraucht
+NODES_PER_SECOND = 100000  # Arbeitseinheiten pro Sekunde Zugzeit; bei 20 Zügen/s sind das 2500 pro Suche
+MIN_NODES = 64
+
+# Bewertung der Blätter als Tupel (schwanz_erreichbar, punkte): ein Zweig mit erreichbarem Schwanz geht immer vor;
+# unter gleichen gilt Fressen vor Nähe zum Futter
+FOOD_VALUE = 500
+DEAD_VALUE = -10 ** 6
+
+
+def simulate_path(snake, path):
+    # Körper (Kopf zuerst) nach dem Weg path (path[0] = Kopf, path[-1] = Futter), wenn am Ende gefressen wird
+    length = len(snake) + 1
+    body = path[:0:-1][:length]
+    if len(body) < length:
+        body.extend(islice(snake, length - len(body)))
+    return body
+
+
+def tail_reachable(cols, rows, body, occupied=None, limit=None):
+    # Breitensuche vom Kopf über freie Felder; der Schwanz gilt als frei (wie Reachability mit free_tail), aber erst
+    # ab Abstand 2: direkt neben dem Kopf blockiert er noch, weil er sein Feld erst nach dem Kollisionstest verlässt.
+    # Mit limit reicht eine Fläche dieser Größe als Antwort, auch ohne den Schwanz gefunden zu haben.
+    if len(body) < 2:
+        return True
+    if occupied is None:
+        occupied = set(body)
+    head, tail = body[0], body[-1]
+    visited = {head}
+    frontier = [head]
+    while frontier:
+        next_frontier = []
+        for x, y in frontier:
+            for neighbor in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if neighbor == tail and (x, y) != head:
+                    return True
+                if (neighbor not in visited and 0 <= neighbor[0] < cols and 0 <= neighbor[1] < rows
+                        and neighbor not in occupied):
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+        if limit is not None and len(visited) > limit:
+            return True
+        frontier = next_frontier
+    return False
+
+
+def path_is_safe(snake, path, limit=None):
+    # Virtuelle Schlange den Weg entlang schicken und prüfen, ob sie danach ihren Schwanz noch erreicht
+    body = simulate_path(snake, path)
+    return tail_reachable(snake.cols, snake.rows, body, limit=limit)
+
+
+class _Search:
+    # Virtuelle Schlange auf Feldindizes über dem Raster des Bretts; Züge werden ausgeführt und zurückgenommen
+    def __init__(self, game, max_nodes, deadline, limit):
+        board = game.snake
+        self.cols = board.cols
+        self.cells = board.cols * board.rows
+        self.food = board.index(game.food)
+        self.food_x, self.food_y = game.food
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        # Jedes Blatt flutet; eine Fläche mit Platz für die doppelte Schlange gilt auch ohne Schwanz als sicher
+        self.limit = limit if limit is not None else 2 * len(board) + 32
+        self.body = deque(board.index(pos) for pos in board)
+        self.grid = board.grid
+        self.nodes = 0
+        self.expired = False
+
+    def moves(self):
+        cols, grid = self.cols, self.grid
+        cell = self.body[0]
+        x = cell % cols
+        for neighbor, inside in ((cell + 1, x + 1 < cols), (cell - 1, x > 0),
+                                 (cell + cols, cell + cols < self.cells), (cell - cols, cell >= cols)):
+            # Auch der Schwanz blockiert: er verlässt sein Feld erst nach dem Kollisionstest
+            if inside and not grid[neighbor]:
+                yield neighbor
+
+    def tail_reachable(self):
+        # Wie tail_reachable() (Schwanz erst ab Abstand 2), aber auf dem Raster der Suche
+        body = self.body
+        if len(body) < 2:
+            return True
+        cols, cells, grid, limit = self.cols, self.cells, self.grid, self.limit
+        head, tail = body[0], body[-1]
+        visited = {head}
+        frontier = [head]
+        while frontier:
+            next_frontier = []
+            for cell in frontier:
+                x = cell % cols
+                for neighbor, inside in ((cell + 1, x + 1 < cols), (cell - 1, x > 0),
+                                         (cell + cols, cell + cols < cells), (cell - cols, cell >= cols)):
+                    if neighbor == tail and inside and cell != head:
+                        self.nodes += len(visited)
+                        return True
+                    if inside and not grid[neighbor] and neighbor not in visited:
+                        visited.add(neighbor)
+                        next_frontier.append(neighbor)
+            if limit is not None and len(visited) > limit:
+                self.nodes += len(visited)
+                return True
+            frontier = next_frontier
+        self.nodes += len(visited)
+        return False
+
+    def evaluate(self, depth, ate):
+        safe = self.tail_reachable()
+        if ate:
+            return safe, FOOD_VALUE - depth
+        head = self.body[0]
+        return safe, -abs(head % self.cols - self.food_x) - abs(head // self.cols - self.food_y)
+
+    def search(self, depth, remaining):
+        # Bester Wert, der in remaining weiteren Zügen erreichbar ist; nodes zählt die verbrauchte Arbeit
+        self.nodes += 1
+        if self.nodes >= self.max_nodes or (self.deadline is not None and time.perf_counter() > self.deadline):
+            self.expired = True
+        if remaining == 0 or self.expired:
+            return self.evaluate(depth, False)
+        best = None
+        for cell in list(self.moves()):
+            value = self.step(cell, depth, remaining - 1)
+            if best is None or value > best:
+                best = value
+        # Eingesperrt: je später, desto besser
+        return (False, DEAD_VALUE + depth) if best is None else best
+
+    def step(self, cell, depth, remaining):
+        # Zug auf cell ausführen, danach noch remaining Züge suchen, und zurücknehmen
+        body, grid = self.body, self.grid
+        body.appendleft(cell)
+        grid[cell] = 1
+        if cell == self.food:
+            # Nach dem Fressen ist das nächste Futter unbekannt; hier endet der Zweig
+            value = self.evaluate(depth + 1, True)
+        else:
+            tail = body.pop()
+            grid[tail] = 0
+            value = self.search(depth + 1, remaining)
+            body.append(tail)
+            grid[tail] = 1
+        body.popleft()
+        grid[cell] = 0
+        return value
+
+
+def plan(game, max_nodes, limit=None, max_depth=MAX_DEPTH, deadline=None):
+    # Iterative Vertiefung bis max_depth, bis max_nodes Knoten besucht sind oder (falls gesetzt) bis zur
+    # Frist deadline (time.perf_counter()).
+    # Gibt (zug, sicher, wert, tiefe) der tiefsten abgeschlossenen Suche zurück; zug ist None ohne freien
+    # Nachbarn. sicher: nach dem Zug gibt es eine Fortsetzung, an deren Ende der Schwanz erreichbar ist.
+    if profiler.active:
+        profiler.active.count("plan")
+    search = _Search(game, max_nodes, deadline, limit)
+    first_moves = list(search.moves())
+    if not first_moves:
+        return None, False, None, 0
+    best_move, best_value, best_depth = None, None, 0
+    for depth in range(1, max_depth + 1):
+        # Bester Zug der letzten Tiefe zuerst, damit eine abgebrochene Suche ihn sicher bewertet hat
+        if best_move is not None:
+            first_moves.remove(best_move)
+            first_moves.insert(0, best_move)
+        move, value = None, None
+        for pos in first_moves:
+            result = search.step(pos, 0, depth - 1)
+            if value is None or result > value:
+                move, value = pos, result
+            if search.expired:
+                break
+        if search.expired:
+            # Unvollständige Tiefe nur nutzen, wenn noch keine abgeschlossen ist
+            if best_move is None:
+                best_move, best_value = move, value
+            break
+        best_move, best_value, best_depth = move, value, depth
+        if value[0] and value[1] > 0:
+            # Sicher gefressen: tiefere Suchen finden nur späteres Fressen, also nichts Besseres
+            break
+    if best_move is None:
+        return None, False, None, best_depth
+    safe, value = best_value
+    return (best_move % search.cols, best_move // search.cols), safe, value, best_depth
+
+
+def node_budget(game):
+    # Arbeitsbudget pro Tick aus der Spielgeschwindigkeit (Züge pro Sekunde)
+    return max(MIN_NODES, int(NODES_PER_SECOND * PLAN_SHARE / max(game.current_speed, 1)))
+
+
+def deadline_for(game):
+    # Frist nur im Fenster: dort darf ein Tick nie länger als der Frame dauern. Headless, im Turnier und
+    # bei Replays entscheidet allein das Knotenbudget, damit Partien reproduzierbar bleiben.
+    if not game.realtime:
+        return None
+    return time.perf_counter() + PLAN_SHARE / max(game.current_speed, 1)
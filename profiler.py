@@ -0,0 +1,153 @@
+# profiler.py
+# Messung pro auto_move-Tick: Wandzeit je Phase, Aufrufe von a_star / Planer (plan) / Reachability,
+# welcher Schritt den Zug geliefert hat. Zeiten landen in HDR-artigen Histogrammen (logarithmische
+# Buckets mit 16 Unterteilungen, ~6% Auflösung, konstanter Speicher) und lassen sich als JSON/CSV exportieren.
+#
+# Ausgeschaltet (active is None) kostet das pro Tick nur ein paar Attributabfragen.
+import csv
+import json
+import time
+
+PHASES = ("strategisch", "futter", "raum", "hamilton", "notfall", "bewegen")
+SUB_BITS = 4
+
+active = None
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value):
+        exponent = value.bit_length()
+        if exponent <= SUB_BITS + 1:
+            return value
+        shift = exponent - SUB_BITS - 1
+        return (shift << SUB_BITS + 1) | (value >> shift)
+
+    @staticmethod
+    def bucket_value(bucket):
+        # Kleinster Wert, der in diesen Bucket fällt
+        if bucket < 1 << SUB_BITS + 1:
+            return bucket
+        shift = bucket >> SUB_BITS + 1
+        return (bucket & ((1 << SUB_BITS + 1) - 1)) << shift
+
+    def record(self, value):
+        bucket = self.bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        if not self.total:
+            return 0
+        target = p / 100 * self.total
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return self.bucket_value(bucket)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else 0.0
+
+    def summary(self):
+        return {"count": self.total, "mean": self.mean(), "p50": self.percentile(50),
+                "p90": self.percentile(90), "p99": self.percentile(99), "max": self.max}
+
+
+class TickProfiler:
+    def __init__(self):
+        self.phase_ns = {phase: Histogram() for phase in PHASES}
+        self.tick_ns = Histogram()
+        self.calls = {"a_star": Histogram(), "plan": Histogram(), "reachability": Histogram()}
+        self.branches = {}
+        self.ticks = 0
+        self._counts = dict.fromkeys(self.calls, 0)
+        self._start = self._mark = 0
+
+    def count(self, name):
+        self._counts[name] += 1
+
+    def begin_tick(self):
+        self._start = self._mark = time.perf_counter_ns()
+        for name in self._counts:
+            self._counts[name] = 0
+
+    def mark(self, phase):
+        # Zeit seit dem letzten mark (bzw. begin_tick) der Phase zuschreiben
+        now = time.perf_counter_ns()
+        self.phase_ns[phase].record(now - self._mark)
+        self._mark = now
+
+    def end_tick(self, branch):
+        self.tick_ns.record(time.perf_counter_ns() - self._start)
+        for name, value in self._counts.items():
+            self.calls[name].record(value)
+        self.branches[branch] = self.branches.get(branch, 0) + 1
+        self.ticks += 1
+
+    def report(self):
+        return {
+            "ticks": self.ticks,
+            "tick_ns": self.tick_ns.summary(),
+            "phase_ns": {phase: h.summary() for phase, h in self.phase_ns.items()},
+            "calls_per_tick": {name: h.summary() for name, h in self.calls.items()},
+            "branches": dict(sorted(self.branches.items(), key=lambda item: -item[1])),
+        }
+
+    def export_json(self, path):
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+    def export_csv(self, path):
+        # Eine Zeile pro Messreihe: Phasenzeiten in ns, Aufrufe pro Tick, Zweighäufigkeiten
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["kind", "name", "count", "mean", "p50", "p90", "p99", "max"])
+            rows = [("tick_ns", "tick", self.tick_ns)] + \
+                   [("phase_ns", name, h) for name, h in self.phase_ns.items()] + \
+                   [("calls_per_tick", name, h) for name, h in self.calls.items()]
+            for kind, name, histogram in rows:
+                s = histogram.summary()
+                writer.writerow([kind, name, s["count"], f"{s['mean']:.3f}", s["p50"], s["p90"], s["p99"], s["max"]])
+            for branch, count in self.branches.items():
+                writer.writerow(["branch", branch, count, "", "", "", "", ""])
+
+    def export(self, path):
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def overlay_lines(self):
+        # Kurzfassung für die Einblendung in SnakeGame.draw
+        tick = self.tick_ns
+        lines = [f"Tick p50 {tick.percentile(50) / 1000:.0f} µs  p99 {tick.percentile(99) / 1000:.0f} µs"]
+        for phase in PHASES:
+            h = self.phase_ns[phase]
+            if h.total:
+                lines.append(f"{phase}: {h.mean() / 1000:.0f} µs")
+        top = sorted(self.branches.items(), key=lambda item: -item[1])[:3]
+        lines.append("Zweige: " + ", ".join(f"{name} {count}" for name, count in top))
+        return lines
+
+
+def enable():
+    global active
+    active = TickProfiler()
+    return active
+
+
+def disable():
+    global active
+    profiler, active = active, None
+    return profiler
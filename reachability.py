@@ -0,0 +1,104 @@
+# reachability.py
+# Zusammenhangskomponenten der freien Felder, bei Bedarf beschriftet.
+# Danach ist "wie viele Felder erreicht der Kopf nach einem Zug in Richtung X?" ein Tabellenzugriff.
+#
+# Beschriftet wird nur die Komponente, nach der gefragt wird. Mit limit bricht die Flutfüllung nach
+# so vielen Feldern ab; auf großen Brettern kostet ein Tick dann O(limit) statt O(Felder).
+import threading
+from array import array
+import profiler
+
+# Bis zu dieser Feldzahl wird ohne Grenze gezählt (Standardbrett: 600 Felder)
+FULL_LABEL_CELLS = 4096
+
+
+class _Labels:
+    # Beschriftungsraster pro Brettgröße, von allen Instanzen eines Threads geteilt. Label-Nummern steigen global,
+    # eine Instanz erkennt ihre eigenen an self.sizes; alte Einträge müssen daher nie gelöscht werden.
+    def __init__(self, cells):
+        self.labels = array('l', [0]) * cells
+        self.next_label = 0
+
+
+# Pro Thread eigene Raster: der Planer-Thread (pipeline.py) und der Hauptthread beschriften gleichzeitig
+_local = threading.local()
+
+
+def _get_labels(cells):
+    buffers = getattr(_local, "labels", None)
+    if buffers is None:
+        buffers = _local.labels = {}
+    labels = buffers.get(cells)
+    if labels is None:
+        labels = buffers[cells] = _Labels(cells)
+    return labels
+
+
+def default_limit(board):
+    # Ohne Grenze auf kleinen Brettern; sonst reicht "Platz für die doppelte Schlange" als Antwort
+    if board.cols * board.rows <= FULL_LABEL_CELLS:
+        return None
+    return 2 * len(board) + 256
+
+
+class Reachability:
+    def __init__(self, board, free_tail=True, limit=None):
+        # free_tail: der Schwanz räumt sein Feld bei einem Zug ohne Futter, er zählt daher als frei
+        if profiler.active:
+            profiler.active.count("reachability")
+        self.board = board
+        self.limit = limit
+        self.tail = board.index(board[-1]) if free_tail and len(board) > 1 else -1
+        self.shared = _get_labels(board.cols * board.rows)
+        self.sizes = {}  # label -> Größe der Fläche (höchstens limit)
+
+    def label(self, pos):
+        board = self.board
+        if not board.in_bounds(pos):
+            return 0
+        cell = board.index(pos)
+        label = self.shared.labels[cell]
+        if label in self.sizes:
+            return label
+        if board.grid[cell] and cell != self.tail:
+            return 0
+        return self._flood(cell)
+
+    def _flood(self, seed):
+        cols = self.board.cols
+        cells = cols * self.board.rows
+        grid = self.board.grid
+        tail = self.tail
+        limit = self.limit
+        labels = self.shared.labels
+        self.shared.next_label += 1
+        label = self.shared.next_label
+
+        labels[seed] = label
+        stack = [seed]
+        size = 0
+        while stack:
+            if limit is not None and size >= limit:
+                break
+            cell = stack.pop()
+            size += 1
+            x = cell % cols
+            for neighbor, inside in ((cell + 1, x + 1 < cols), (cell - 1, x > 0),
+                                     (cell + cols, cell + cols < cells), (cell - cols, cell >= cols)):
+                # Zellen anderer eigener Komponenten sind nie frei benachbart; bei einer abgebrochenen
+                # Füllung wird dieselbe Komponente höchstens neu beschriftet, beide Größen sind dann limit
+                if inside and labels[neighbor] != label and (not grid[neighbor] or neighbor == tail):
+                    labels[neighbor] = label
+                    stack.append(neighbor)
+        self.sizes[label] = size
+        return label
+
+    def area(self, pos):
+        # Größe der freien Fläche, in der pos liegt (0, wenn pos belegt oder außerhalb ist; höchstens limit)
+        label = self.label(pos)
+        return self.sizes[label] if label else 0
+
+    def areas_after_move(self, head):
+        # Fläche für alle vier Nachbarn des Kopfes auf einmal: [(neues_feld, fläche), ...]
+        x, y = head
+        return [(pos, self.area(pos)) for pos in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))]
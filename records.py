@@ -0,0 +1,191 @@
+# records.py
+# Append-only Spielarchiv in SQLite: eine Zeile pro Partie mit Score, Deckung, Länge, Zügen, Seed, Dauer und Spielende.
+# Die Kennzahlen fürs HUD (Top 5, letzte 5 Scores, Durchschnitt der letzten 10 Deckungen) hält Aggregates im Speicher.
+# Jede neue Partie aktualisiert sie in O(1); beim Öffnen werden sie mit zwei indizierten Abfragen geladen,
+# die Historie wird dafür nie ganz gelesen.
+# Die HUD-Listen früherer Versionen (highscores.txt, last_scores.txt, coverage_history.txt) übernimmt
+# import_legacy() einmalig in eine eigene Tabelle. Sie gehören zu keiner bestimmten Partie und landen daher nicht
+# in games, sondern gehen nur in die Kennzahlen ein, bis neue Partien sie verdrängen.
+#
+# Aufruf:
+#   python records.py stats                       # Kennzahlen anzeigen
+#   python records.py export partien.csv          # alle Partien als CSV (oder .jsonl) exportieren
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+from collections import deque
+
+DEFAULT_PATH = "snake_records.sqlite3"
+FIELDS = ("seed", "score", "coverage", "length", "moves", "duration", "death_cause")
+TOP_N = 5
+LAST_N = 5
+COVERAGE_WINDOW = 10
+LEGACY_FILES = {"top": "highscores.txt", "last": "last_scores.txt", "coverage": "coverage_history.txt"}
+
+
+class Aggregates:
+    def __init__(self, top_n=TOP_N, last_n=LAST_N, window=COVERAGE_WINDOW):
+        self.top_n = top_n
+        self.top = []  # beste Scores, absteigend, höchstens top_n
+        self.last = deque(maxlen=last_n)  # letzte Scores, älteste zuerst
+        self.coverage = deque(maxlen=window)
+        self.coverage_sum = 0.0
+        self.games = 0
+
+    def add(self, score, coverage):
+        if len(self.top) < self.top_n or score > self.top[-1]:
+            self.top.append(score)
+            self.top.sort(reverse=True)
+            del self.top[self.top_n:]
+        self.last.append(score)
+        self.add_coverage(coverage)
+        self.games += 1
+
+    def add_coverage(self, coverage):
+        if len(self.coverage) == self.coverage.maxlen:
+            self.coverage_sum -= self.coverage[0]
+        self.coverage.append(coverage)
+        self.coverage_sum += coverage
+
+    def average_coverage(self):
+        return self.coverage_sum / len(self.coverage) if self.coverage else 0.0
+
+    def average_score(self):
+        # Gleitender Mittelwert über die letzten last_n Partien
+        return sum(self.last) / len(self.last) if self.last else 0.0
+
+
+class RecordStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        if path != ":memory:":
+            # WAL: Anhängen blockiert keine Leser (z.B. einen Export während eines Turniers)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "id INTEGER PRIMARY KEY, created REAL NOT NULL, seed INTEGER, score INTEGER NOT NULL, "
+            "coverage REAL NOT NULL, length INTEGER, moves INTEGER, duration REAL, death_cause TEXT)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS games_score ON games (score DESC)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS legacy (id INTEGER PRIMARY KEY, list TEXT NOT NULL, value REAL NOT NULL)")
+        self.connection.commit()
+        self.aggregates = self.load_aggregates()
+
+    def load_aggregates(self):
+        aggregates = Aggregates()
+        db = self.connection
+        # Übernommene Listen sind älter als jede Partie im Archiv und kommen zuerst
+        legacy = {name: [] for name in LEGACY_FILES}
+        for name, value in db.execute("SELECT list, value FROM legacy ORDER BY id"):
+            legacy.setdefault(name, []).append(value)
+        aggregates.last.extend(int(score) for score in legacy["last"])
+        for coverage in legacy["coverage"]:
+            aggregates.add_coverage(coverage)
+        window = max(aggregates.last.maxlen, aggregates.coverage.maxlen)
+        recent = db.execute("SELECT score, coverage FROM games ORDER BY id DESC LIMIT ?", (window,)).fetchall()
+        for score, coverage in reversed(recent):
+            aggregates.add(score, coverage)
+        # add() hat nur die letzten Partien gesehen; Top-N und Anzahl kommen aus Index bzw. Rowid
+        top = [row[0] for row in
+               db.execute("SELECT score FROM games ORDER BY score DESC LIMIT ?", (aggregates.top_n,))]
+        aggregates.top = sorted(top + [int(score) for score in legacy["top"]], reverse=True)[:aggregates.top_n]
+        aggregates.games = db.execute("SELECT COALESCE(MAX(id), 0) FROM games").fetchone()[0]
+        return aggregates
+
+    def import_legacy(self, files=LEGACY_FILES):
+        # Einmalig die Textdateien früherer Versionen übernehmen; gibt die Anzahl der Werte zurück.
+        # Hat die Tabelle schon Einträge, ist der Import gelaufen und die Dateien werden nicht mehr gelesen.
+        if self.connection.execute("SELECT 1 FROM legacy LIMIT 1").fetchone():
+            return 0
+        rows = []
+        for name, path in files.items():
+            if os.path.exists(path):
+                with open(path) as file:
+                    rows.extend((name, float(line)) for line in file if line.strip())
+        if rows:
+            with self.connection:
+                self.connection.executemany("INSERT INTO legacy (list, value) VALUES (?, ?)", rows)
+            self.aggregates = self.load_aggregates()
+        return len(rows)
+
+    def _row(self, record):
+        return (time.time(),) + tuple(record.get(field) for field in FIELDS)
+
+    def append(self, record):
+        # record: dict mit den Feldern aus FIELDS (weitere Schlüssel werden ignoriert)
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO games (created, " + ", ".join(FIELDS) + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row(record))
+        self.aggregates.add(record["score"], record["coverage"])
+
+    def append_many(self, records):
+        # Viele Partien in einer Transaktion, z.B. nach einem headless-Lauf
+        records = list(records)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO games (created, " + ", ".join(FIELDS) + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._row(record) for record in records])
+        for record in records:
+            self.aggregates.add(record["score"], record["coverage"])
+
+    def iter_records(self, batch_size=1000):
+        # Alle Partien in Einfügereihenfolge, blockweise gelesen
+        cursor = self.connection.execute("SELECT id, created, " + ", ".join(FIELDS) + " FROM games ORDER BY id")
+        columns = [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def export(self, path):
+        # Massenexport als CSV oder (bei .jsonl) als JSON-Lines; gibt die Anzahl der Zeilen zurück
+        count = 0
+        with open(path, "w", newline="") as file:
+            if path.endswith(".jsonl"):
+                for record in self.iter_records():
+                    file.write(json.dumps(record) + "\n")
+                    count += 1
+            else:
+                writer = csv.writer(file)
+                writer.writerow(("id", "created") + FIELDS)
+                for record in self.iter_records():
+                    writer.writerow(record.values())
+                    count += 1
+        return count
+
+    def close(self):
+        self.connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spielarchiv anzeigen und exportieren")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="Pfad der SQLite-Datei")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Top-Scores, letzte Scores und Durchschnittsdeckung anzeigen")
+    export_parser = sub.add_parser("export", help="Alle Partien als .csv oder .jsonl exportieren")
+    export_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    store = RecordStore(args.db)
+    if args.command == "stats":
+        aggregates = store.aggregates
+        print(f"Partien: {aggregates.games}")
+        print(f"Top {aggregates.top_n}: {', '.join(str(score) for score in aggregates.top)}")
+        print(f"Letzte Scores: {', '.join(str(score) for score in aggregates.last)} "
+              f"(Durchschn. {aggregates.average_score():.1f})")
+        print(f"Durchschn. Deckung (letzte {aggregates.coverage.maxlen}): {aggregates.average_coverage():.1f}%")
+    else:
+        print(f"{store.export(args.path)} Partien nach {args.path} exportiert")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# renderer.py
+# Zeichnet SnakeGame inkrementell: pro Frame nur neue Köpfe, geräumte Schwanzfelder und das Futter.
+# Schriften und HUD-Texte werden zwischengespeichert und nur neu gerendert, wenn sich ihre Werte ändern.
+# draw() gibt die geänderten Rechtecke für pygame.display.update(dirty_rects) zurück.
+# Läuft auch mit SDL_VIDEODRIVER=dummy. Das Spiel rechnet in Feldern; erst hier wird mit GRID_SIZE skaliert.
+from collections import deque
+import pygame
+from constants import *
+import profiler
+
+_fonts = {}
+
+
+def get_font(size):
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+
+def cell_rect(pos):
+    # Pixelrechteck des Feldes pos = (Spalte, Zeile)
+    return (pos[0] * GRID_SIZE, pos[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+
+
+class Panel:
+    # Vorgerenderter HUD-Block: wird nur neu gebaut, wenn sich der Schlüssel (die angezeigten Werte) ändert
+    def __init__(self, x, y, width, height):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.key = None
+        self.surface = None
+
+    def update(self, key, lines):
+        # lines: [(text, dy, size, color), ...]; gibt True zurück, wenn neu gerendert wurde
+        if key == self.key:
+            return False
+        self.key = key
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        for text, dy, size, color in lines:
+            self.surface.blit(get_font(size).render(text, True, color), (0, dy))
+        return True
+
+
+class Renderer:
+    def __init__(self):
+        self.score_panel = Panel(10, 10, 360, 70)
+        self.highscore_panel = Panel(WIDTH - 200, 10, 200, 140)
+        self.last_panel = Panel(10, HEIGHT - 120, 200, 120)
+        self.profile_panel = Panel(WIDTH - 260, HEIGHT - 150, 260, 150)
+        self.panels = (self.score_panel, self.highscore_panel, self.last_panel)
+        self.show_profile = False
+        self.board = None
+        self.drawn = deque()  # Spiegel der gezeichneten Körperfelder, Kopf vorne
+        self.drawn_food = None
+        self.pushes = 0
+        self.game_over = False
+
+    def update_panels(self, game):
+        changed = []
+        coverage = round(game.get_average_coverage(), 1)
+        speed = round(game.get_speed_cm_per_min(), 1)
+        if self.score_panel.update((game.score, coverage, speed), [
+                (f"Punkte: {game.score}", 0, 24, WHITE),
+                (f"Durchschn. Deckung (letzte 10): {coverage:.1f}%", 30, 20, GREEN),
+                (f"Tempo: {speed:.1f} cm/min", 50, 20, YELLOW)]):
+            changed.append(self.score_panel)
+        highscores = tuple(game.highscores)
+        if self.highscore_panel.update(highscores, [("Top 5 High-Scores:", 0, 24, YELLOW)] +
+                                       [(f"{i+1}. {score}", 30 + i * 20, 20, YELLOW) for i, score in enumerate(highscores)]):
+            changed.append(self.highscore_panel)
+        last_scores = tuple(game.last_scores)
+        if self.last_panel.update(last_scores, [("Letzte 5 Scores:", 0, 24, YELLOW)] +
+                                  [(f"{i+1}. {score}", 30 + i * 20, 20, YELLOW) for i, score in enumerate(last_scores)]):
+            changed.append(self.last_panel)
+        prof = profiler.active
+        if prof:
+            # Nur alle 30 Ticks neu rendern, sonst wäre das Panel in jedem Frame schmutzig
+            if self.profile_panel.update((id(prof), prof.ticks // 30),
+                                         [(line, i * 16, 18, WHITE) for i, line in enumerate(prof.overlay_lines())]):
+                changed.append(self.profile_panel)
+        return changed
+
+    def draw(self, screen, game):
+        changed_panels = self.update_panels(game)
+        snake = game.snake
+        new_heads = snake.pushes - self.pushes
+        show_profile = profiler.active is not None
+        if (snake is not self.board or game.game_over != self.game_over or show_profile != self.show_profile or
+                new_heads < 0 or new_heads > len(snake)):
+            return self.draw_full(screen, game)
+
+        dirty = {}  # (x, y) -> Rect; jedes Feld nur einmal, damit Panels nicht doppelt darüber geblittet werden
+        # Neue Köpfe in den Spiegel übernehmen, dann so viele Schwanzfelder abräumen, bis die Länge passt
+        for i in range(new_heads - 1, -1, -1):
+            self.drawn.appendleft(snake[i])
+        while len(self.drawn) > len(snake):
+            pos = self.drawn.pop()
+            if not snake.is_occupied(pos):
+                dirty[pos] = pygame.draw.rect(screen, BLACK, cell_rect(pos))
+        for i in range(new_heads):
+            pos = snake[i]
+            dirty[pos] = pygame.draw.rect(screen, GREEN, cell_rect(pos))
+        self.pushes = snake.pushes
+
+        if game.food != self.drawn_food:
+            if self.drawn_food is not None and not snake.is_occupied(self.drawn_food):
+                dirty[self.drawn_food] = pygame.draw.rect(screen, BLACK, cell_rect(self.drawn_food))
+            if game.food is not None:
+                dirty[game.food] = pygame.draw.rect(screen, RED, cell_rect(game.food))
+            self.drawn_food = game.food
+
+        rects = list(dirty.values())
+        for panel in self.visible_panels():
+            if panel in changed_panels:
+                # Neuer Text: Spielfeld unter dem Panel wiederherstellen und das ganze Panel einblenden
+                self.restore(screen, game, panel.rect)
+                screen.blit(panel.surface, panel.rect)
+                rects.append(panel.rect)
+            else:
+                # Frisch gezeichnete Felder unter einem Panel: nur den passenden Ausschnitt darüberlegen
+                for rect in rects:
+                    clip = rect.clip(panel.rect)
+                    if clip:
+                        screen.blit(panel.surface, clip, clip.move(-panel.rect.x, -panel.rect.y))
+        return rects
+
+    def restore(self, screen, game, rect):
+        # Spielfeld innerhalb von rect neu zeichnen (Hintergrund, Körper, Futter)
+        screen.fill(BLACK, rect)
+        snake = game.snake
+        for y in range(rect.top // GRID_SIZE, (rect.bottom - 1) // GRID_SIZE + 1):
+            for x in range(rect.left // GRID_SIZE, (rect.right - 1) // GRID_SIZE + 1):
+                if (x, y) == game.food:
+                    pygame.draw.rect(screen, RED, cell_rect((x, y)))
+                elif snake.is_occupied((x, y)):
+                    pygame.draw.rect(screen, GREEN, cell_rect((x, y)))
+
+    def draw_full(self, screen, game):
+        screen.fill(BLACK)
+        for segment in game.snake:
+            pygame.draw.rect(screen, GREEN, cell_rect(segment))
+        if game.food is not None:
+            pygame.draw.rect(screen, RED, cell_rect(game.food))
+        for panel in self.visible_panels():
+            screen.blit(panel.surface, panel.rect)
+
+        if game.game_over:
+            self.draw_text(screen, "Game Over!", WIDTH // 2 - 60, HEIGHT // 3, 32, WHITE)
+            pygame.draw.rect(screen, YELLOW, game.restart_button_rect)
+            self.draw_text(screen, "Neustart", WIDTH // 2 - 40, HEIGHT // 2 + 70, 22, BLACK)
+
+        self.board = game.snake
+        self.drawn = deque(game.snake)
+        self.drawn_food = game.food
+        self.pushes = game.snake.pushes
+        self.game_over = game.game_over
+        self.show_profile = profiler.active is not None
+        return [screen.get_rect()]
+
+    def visible_panels(self):
+        if profiler.active:
+            return self.panels + (self.profile_panel,)
+        return self.panels
+
+    def draw_text(self, screen, text, x, y, size=24, color=WHITE):
+        screen.blit(get_font(size).render(text, True, color), (x, y))
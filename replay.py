@@ -0,0 +1,328 @@
+# replay.py
+# Reproduzierbare Partien: Seed plus 2 Bit pro Zug, dazu alle KEYFRAME_INTERVAL Züge ein Schnappschuss
+# (Körper mit 2 Bit pro Segment, Futter, Punkte, Zustand des Zufallsgenerators).
+# Abspielen braucht keine Strategie: die Züge laufen über SnakeCore.advance, Futter kommt aus demselben
+# Zufallsgenerator. Springen zu einem Tick kostet höchstens KEYFRAME_INTERVAL Züge ab dem letzten Schnappschuss.
+#
+# Aufruf:
+#   python replay.py record --seed 4 partie.snkr     # Partie mit auto_move spielen und aufzeichnen
+#   python replay.py info partie.snkr
+#   python replay.py seek partie.snkr 25000          # Zustand bei Tick 25000
+#   python replay.py verify partie.snkr              # ganz nachspielen und mit dem Ende vergleichen
+import argparse
+import struct
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from constants import COLS, ROWS, UP, DOWN, LEFT, RIGHT
+from board import Board
+from core import SnakeCore
+from log import get_logger
+
+logger = get_logger("replay")
+
+MAGIC = b"SNKR"
+VERSION = 1
+KEYFRAME_INTERVAL = 16384
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)  # Zugcode 0..3
+NO_CELL = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sBIIqIQIIH")  # magic, version, cols, rows, seed, interval, moves, score, length, len(cause)
+_KEYFRAME = struct.Struct("<QIIIII")  # tick, score, max_length, food, Körperlänge, Schwanzfeld
+_EVENT = struct.Struct("<QI")  # tick, food
+
+
+def _code(from_pos, to_pos):
+    return DIRECTIONS.index((to_pos[0] - from_pos[0], to_pos[1] - from_pos[1]))
+
+
+def _pack_codes(codes):
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i >> 2] |= code << ((i & 3) << 1)
+    return bytes(packed)
+
+
+def _unpack_code(packed, i):
+    return (packed[i >> 2] >> ((i & 3) << 1)) & 3
+
+
+def _cell(board, pos):
+    return NO_CELL if pos is None else board.index(pos)
+
+
+def _pos(board, cell):
+    return None if cell == NO_CELL else board.cell_pos(cell)
+
+
+class Keyframe:
+    def __init__(self, tick, score, max_length, food, body, rng_state):
+        self.tick = tick
+        self.score = score
+        self.max_length = max_length
+        self.food = food  # Feldindex oder NO_CELL
+        self.body = body  # (Schwanzfeld, gepackte Richtungen vom Schwanz zum Kopf, Länge)
+        self.rng_state = rng_state
+
+    @classmethod
+    def capture(cls, game):
+        snake = game.snake
+        segments = list(reversed(snake.body))
+        codes = [_code(a, b) for a, b in zip(segments, segments[1:])]
+        body = (snake.index(segments[0]), _pack_codes(codes), len(segments))
+        return cls(game.moves, game.score, game.max_length, _cell(snake, game.food), body, game.rng.getstate())
+
+    def segments(self, board):
+        # Körper vom Kopf zum Schwanz, wie ihn Board erwartet
+        tail, packed, length = self.body
+        pos = board.cell_pos(tail)
+        segments = [pos]
+        for i in range(length - 1):
+            dx, dy = DIRECTIONS[_unpack_code(packed, i)]
+            pos = (pos[0] + dx, pos[1] + dy)
+            segments.append(pos)
+        return segments[::-1]
+
+    def write(self, out):
+        tail, packed, length = self.body
+        out += _KEYFRAME.pack(self.tick, self.score, self.max_length, self.food, length, tail)
+        out += packed
+        version, state, gauss = self.rng_state
+        out += struct.pack("<Bd", gauss is not None, gauss or 0.0)
+        out += array('I', state).tobytes()
+
+    @classmethod
+    def read(cls, data, offset):
+        tick, score, max_length, food, length, tail = _KEYFRAME.unpack_from(data, offset)
+        offset += _KEYFRAME.size
+        size = (length + 2) // 4
+        packed = bytes(data[offset:offset + size])
+        offset += size
+        has_gauss, gauss = struct.unpack_from("<Bd", data, offset)
+        offset += 9
+        state = array('I')
+        state.frombytes(data[offset:offset + 625 * 4])
+        offset += 625 * 4
+        rng_state = (3, tuple(state), gauss if has_gauss else None)
+        return cls(tick, score, max_length, food, (tail, packed, length), rng_state), offset
+
+
+class Replay:
+    def __init__(self, cols, rows, seed, interval=KEYFRAME_INTERVAL):
+        self.cols = cols
+        self.rows = rows
+        self.seed = seed
+        self.interval = interval
+        self.moves = bytearray()  # 4 Züge pro Byte
+        self.count = 0
+        self.food_events = {}  # tick -> Futterfeld, wenn die Strategie das Futter neu gesetzt hat
+        self.keyframes = []
+        self.score = 0
+        self.length = 1
+        self.death_cause = ""
+
+    def code(self, tick):
+        return _unpack_code(self.moves, tick)
+
+    def save(self, path):
+        cause = self.death_cause.encode()
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.cols, self.rows, self.seed, self.interval,
+                                     self.count, self.score, self.length, len(cause)))
+        out += cause
+        moves = zlib.compress(bytes(self.moves), 6)
+        out += struct.pack("<I", len(moves)) + moves
+        out += struct.pack("<I", len(self.food_events))
+        for tick, cell in self.food_events.items():
+            out += _EVENT.pack(tick, cell)
+        out += struct.pack("<I", len(self.keyframes))
+        for keyframe in self.keyframes:
+            keyframe.write(out)
+        with open(path, "wb") as file:
+            file.write(out)
+        return len(out)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = memoryview(file.read())
+        magic, version, cols, rows, seed, interval, count, score, length, cause_size = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} ist keine Replay-Datei (Version {VERSION})")
+        replay = cls(cols, rows, seed, interval)
+        offset = _HEADER.size
+        replay.death_cause = bytes(data[offset:offset + cause_size]).decode()
+        offset += cause_size
+        replay.count, replay.score, replay.length = count, score, length
+        (size,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        replay.moves = zlib.decompress(data[offset:offset + size])
+        offset += size
+        (events,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for _ in range(events):
+            tick, cell = _EVENT.unpack_from(data, offset)
+            replay.food_events[tick] = cell
+            offset += _EVENT.size
+        (keyframes,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for _ in range(keyframes):
+            keyframe, offset = Keyframe.read(data, offset)
+            replay.keyframes.append(keyframe)
+        return replay
+
+
+class Recorder:
+    # Hängt sich über game.recorder in SnakeCore.advance ein; eine Aufzeichnung pro Partie
+    def __init__(self, game, interval=KEYFRAME_INTERVAL):
+        self.replay = Replay(game.cols, game.rows, game.seed, interval)
+        self.replay.keyframes.append(Keyframe.capture(game))
+        self.last_food = game.food
+        self.last_head = game.snake[0]
+        game.recorder = self
+
+    def record(self, game, new_head, food):
+        replay = self.replay
+        tick = replay.count
+        if food != self.last_food:
+            # Futter wurde außerhalb von advance neu gezogen (auto_move nach mehreren Fehlversuchen)
+            replay.food_events[tick] = _cell(game.snake, food)
+        if not tick & 3:
+            replay.moves.append(0)
+        replay.moves[-1] |= _code(self.last_head, new_head) << ((tick & 3) << 1)
+        replay.count += 1
+        self.last_head = new_head
+        self.last_food = game.food
+        if replay.count % replay.interval == 0:
+            replay.keyframes.append(Keyframe.capture(game))
+
+    def finish(self, game):
+        game.recorder = None
+        self.replay.score = game.score
+        self.replay.length = len(game.snake)
+        self.replay.death_cause = game.death_cause or "max_moves"
+        return self.replay
+
+
+class Player:
+    # Spielt eine Aufzeichnung ohne Strategie nach; game ist der Spielstand beim aktuellen Tick
+    def __init__(self, replay):
+        self.replay = replay
+        self.keyframe_ticks = [keyframe.tick for keyframe in replay.keyframes]
+        self.game = None
+        self.restore(replay.keyframes[0])
+
+    @property
+    def tick(self):
+        return self.game.moves
+
+    def restore(self, keyframe):
+        replay = self.replay
+        game = SnakeCore(replay.seed, cols=replay.cols, rows=replay.rows)
+        board = game.snake
+        game.snake = Board(replay.cols, replay.rows, keyframe.segments(board))
+        game.visited = set(game.snake)
+        game.food = _pos(board, keyframe.food)
+        game.score = keyframe.score
+        game.max_length = keyframe.max_length
+        game.moves = keyframe.tick
+        game.rng.setstate(keyframe.rng_state)
+        self.game = game
+
+    def step(self):
+        # Einen aufgezeichneten Zug ausführen; False am Ende der Aufzeichnung
+        game, replay = self.game, self.replay
+        tick = game.moves
+        if tick >= replay.count:
+            return False
+        cell = replay.food_events.get(tick)
+        if cell is not None:
+            # Wie im Original neu ziehen, damit der Zufallsgenerator gleich weiterläuft
+            game.food = game.spawn_food()
+            if _cell(game.snake, game.food) != cell:
+                logger.warning("Replay weicht bei Tick %s ab: Futter %s statt %s", tick, game.food, _pos(game.snake, cell))
+                game.food = _pos(game.snake, cell)
+        dx, dy = DIRECTIONS[replay.code(tick)]
+        head = game.snake[0]
+        game.advance((head[0] + dx, head[1] + dy))
+        return True
+
+    def seek(self, tick):
+        # Zum Tick springen: ab dem letzten Schnappschuss davor (oder dem aktuellen Stand) vorspulen
+        tick = max(0, min(tick, self.replay.count))
+        keyframe = self.replay.keyframes[bisect_right(self.keyframe_ticks, tick) - 1]
+        if not (keyframe.tick <= self.game.moves <= tick):
+            self.restore(keyframe)
+        while self.game.moves < tick:
+            self.step()
+        return self.game
+
+    def run(self):
+        # Bis zum Ende nachspielen
+        while self.step():
+            pass
+        return self.game
+
+
+def record_game(seed, max_moves=200000, strategy=None, cols=COLS, rows=ROWS, interval=KEYFRAME_INTERVAL):
+    game = SnakeCore(seed, strategy, cols, rows)
+    recorder = Recorder(game, interval)
+    while not game.game_over and game.moves < max_moves:
+        game.move()
+    return recorder.finish(game)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partien aufzeichnen, abspielen und prüfen")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record_parser = sub.add_parser("record", help="Partie mit auto_move spielen und aufzeichnen")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--seed", type=int, default=None)
+    record_parser.add_argument("--max-moves", type=int, default=200000)
+    record_parser.add_argument("--cols", type=int, default=COLS)
+    record_parser.add_argument("--rows", type=int, default=ROWS)
+    record_parser.add_argument("--interval", type=int, default=KEYFRAME_INTERVAL, help="Züge zwischen Schnappschüssen")
+    sub.add_parser("info", help="Kopfdaten anzeigen").add_argument("path")
+    seek_parser = sub.add_parser("seek", help="Spielstand bei einem Tick anzeigen")
+    seek_parser.add_argument("path")
+    seek_parser.add_argument("tick", type=int)
+    sub.add_parser("verify", help="Ganz nachspielen und mit dem gespeicherten Ende vergleichen").add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        start = time.perf_counter()
+        replay = record_game(args.seed, args.max_moves, cols=args.cols, rows=args.rows, interval=args.interval)
+        size = replay.save(args.path)
+        print(f"Seed {replay.seed}: {replay.count} Züge, Score {replay.score}, Ende: {replay.death_cause}, "
+              f"{size / 1024:.1f} KB in {time.perf_counter() - start:.2f} s")
+        return 0
+
+    start = time.perf_counter()
+    replay = Replay.load(args.path)
+    loaded = time.perf_counter() - start
+    if args.command == "info":
+        print(f"{replay.cols}x{replay.rows}, Seed {replay.seed}, {replay.count} Züge, "
+              f"Score {replay.score}, Länge {replay.length}, Ende: {replay.death_cause}, "
+              f"{len(replay.keyframes)} Schnappschüsse, {len(replay.food_events)} Futter-Ereignisse, "
+              f"geladen in {loaded * 1000:.1f} ms")
+        return 0
+
+    player = Player(replay)
+    start = time.perf_counter()
+    if args.command == "seek":
+        game = player.seek(args.tick)
+        print(f"Tick {game.moves}: Kopf {game.snake[0]}, Länge {len(game.snake)}, Score {game.score}, "
+              f"Futter {game.food} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+        return 0
+
+    game = player.run()
+    elapsed = time.perf_counter() - start
+    ok = game.score == replay.score and len(game.snake) == replay.length
+    print(f"{game.moves} Züge in {elapsed:.2f} s ({game.moves / elapsed if elapsed else 0:.0f} Züge/s), "
+          f"Score {game.score}/{replay.score}, Länge {len(game.snake)}/{replay.length}: "
+          f"{'OK' if ok else 'ABWEICHUNG'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,76 @@
+# scheduler.py
+# Trennt Simulationstakt und Bildrate: fester Zeitschritt mit Akkumulator, Turbo (N Züge pro Frame),
+# nur jedes K-te Frame zeichnen, Pause und Einzelschritt. Kommt ohne pygame aus.
+import time
+
+TURBO_LEVELS = (0, 10, 100, 1000, 10000)  # Züge pro Frame; 0 = normaler fester Takt
+RENDER_EVERY_LEVELS = (1, 2, 5, 10)
+
+
+class Scheduler:
+    def __init__(self, render_fps=60, frame_budget=None, max_catch_up=5):
+        self.render_fps = render_fps
+        # Zeit pro Frame, die höchstens simuliert werden darf, damit Fenster und Tasten flüssig bleiben
+        self.frame_budget = frame_budget if frame_budget is not None else 0.8 / render_fps
+        self.max_catch_up = max_catch_up  # nach einem Hänger höchstens so viele Ticks nachholen
+        self.accumulator = 0.0
+        self.turbo = 0
+        self.render_every = 1
+        self.paused = False
+        self.pending_steps = 0
+        self.frame = 0
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        self.accumulator = 0.0
+
+    def request_step(self):
+        # Einzelschritt, nur im Pausenmodus wirksam
+        if self.paused:
+            self.pending_steps += 1
+
+    def cycle_turbo(self):
+        self.turbo = TURBO_LEVELS[(TURBO_LEVELS.index(self.turbo) + 1) % len(TURBO_LEVELS)]
+        self.accumulator = 0.0
+
+    def cycle_render_every(self):
+        self.render_every = RENDER_EVERY_LEVELS[(RENDER_EVERY_LEVELS.index(self.render_every) + 1) % len(RENDER_EVERY_LEVELS)]
+
+    def due_steps(self, dt, sim_rate):
+        # Wie viele Simulationsschritte in diesem Frame fällig sind
+        if self.paused:
+            steps, self.pending_steps = self.pending_steps, 0
+            return steps
+        if self.turbo:
+            return self.turbo
+        step = 1.0 / max(sim_rate, 1e-6)
+        self.accumulator = min(self.accumulator + dt, step * self.max_catch_up)
+        steps = int(self.accumulator / step)
+        self.accumulator -= steps * step
+        return steps
+
+    def run(self, game, dt, move=None):
+        # Fällige Züge ausführen; im Turbo wird nach Ablauf des Frame-Budgets abgebrochen.
+        # move: Funktion für einen Zug, Standard game.move (z.B. PlannerThread.move aus pipeline.py)
+        move = move or game.move
+        steps = self.due_steps(dt, game.current_speed)
+        done = 0
+        deadline = time.perf_counter() + self.frame_budget if self.turbo and not self.paused else None
+        while done < steps and not game.game_over:
+            move()
+            done += 1
+            if deadline is not None and done % 16 == 0 and time.perf_counter() > deadline:
+                break
+        self.frame += 1
+        return done
+
+    def should_render(self):
+        return self.paused or self.frame % self.render_every == 0
+
+    def status(self):
+        if self.paused:
+            return "Pause (N = Schritt)"
+        parts = [f"Turbo {self.turbo}/Frame" if self.turbo else "Normal"]
+        if self.render_every > 1:
+            parts.append(f"Bild jedes {self.render_every}. Frame")
+        return ", ".join(parts)
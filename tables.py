@@ -0,0 +1,190 @@
+# tables.py
+# Tabellen, die nur von der Brettgröße abhängen, als Feldindex-Arrays (int32):
+#   order          Hamilton-Zyklus als Folge von Feldern
+#   index_of       Feld -> Position im Zyklus
+#   next_cell      Feld -> Nachfolger im Zyklus
+#   wall_distance  Feld -> Abstand zur nächsten Wand (0 = am Rand)
+#   adjacency      4 Einträge pro Feld (rechts, links, unten, oben), -1 außerhalb des Bretts
+# "python tables.py precompute" schreibt sie in eine Binärdatei pro Brettgröße; get_tables() blendet diese
+# per mmap ein, statt sie neu zu berechnen. Ohne Datei werden die Tabellen beim ersten Zugriff berechnet.
+# Die Arrays werden von allen Spielen geteilt und nur gelesen.
+#
+# Aufruf: python tables.py precompute 30x20 200x200 1000x1000
+#         python tables.py info 1000x1000
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from functools import cached_property, lru_cache
+
+TABLES_DIR = os.environ.get("SNAKE_TABLES", "tables")
+MAGIC = b"SNKT"
+VERSION = 1
+HEADER = struct.Struct("<4sIII16x")  # Magic, Version, Spalten, Zeilen; 32 Byte, damit die Arrays ausgerichtet sind
+SECTIONS = ("order", "index_of", "next_cell", "wall_distance", "adjacency")
+WIDTH = {"adjacency": 4}  # Einträge pro Feld, sonst 1
+
+
+def cycle_order(cols, rows):
+    # Zeile 0 komplett nach rechts, die übrigen Zeilen im Zickzack über die Spalten 1..cols-1,
+    # zurück über Spalte 0. Geht für eine gerade Zeilenzahl; sonst dasselbe transponiert.
+    # Sind beide Seiten ungerade, gibt es keinen Zyklus und es bleibt der einfache Zickzack-Pfad.
+    if rows % 2 == 0 and cols > 1:
+        order = [col for col in range(cols)]
+        for row in range(1, rows):
+            cols_in_row = range(cols - 1, 0, -1) if row % 2 == 1 else range(1, cols)
+            order.extend(row * cols + col for col in cols_in_row)
+        order.extend(row * cols for row in range(rows - 1, 0, -1))
+        return order
+    if cols % 2 == 0 and rows > 1:
+        order = [row * cols for row in range(rows)]
+        for col in range(1, cols):
+            rows_in_col = range(rows - 1, 0, -1) if col % 2 == 1 else range(1, rows)
+            order.extend(row * cols + col for row in rows_in_col)
+        order.extend(col for col in range(cols - 1, 0, -1))
+        return order
+    order = []
+    for row in range(rows):
+        cols_in_row = range(cols) if row % 2 == 0 else range(cols - 1, -1, -1)
+        order.extend(row * cols + col for col in cols_in_row)
+    return order
+
+
+def table_path(cols, rows, directory=None):
+    return os.path.join(directory or TABLES_DIR, f"{cols}x{rows}.snkt")
+
+
+class Tables:
+    def __init__(self, cols, rows, path=None):
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.path = None
+        self.buffer = None
+        self.mapped = {}
+        if path and os.path.exists(path):
+            self._map(path)
+
+    def _map(self, path):
+        # Datei einblenden, wenn Kopf und Größe passen; sonst bleibt es beim Berechnen
+        if sys.byteorder != "little":
+            return
+        with open(path, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # leere Datei
+                return
+        magic, version, cols, rows = HEADER.unpack_from(buffer)
+        size = HEADER.size + 4 * self.cells * sum(WIDTH.get(name, 1) for name in SECTIONS)
+        if (magic, version, cols, rows) != (MAGIC, VERSION, self.cols, self.rows) or len(buffer) != size:
+            buffer.close()
+            return
+        view = memoryview(buffer)
+        offset = HEADER.size
+        for name in SECTIONS:
+            length = 4 * self.cells * WIDTH.get(name, 1)
+            self.mapped[name] = view[offset:offset + length].cast("i")
+            offset += length
+        self.path = path
+        self.buffer = buffer
+
+    @cached_property
+    def order(self):
+        if "order" in self.mapped:
+            return self.mapped["order"]
+        return array("i", cycle_order(self.cols, self.rows))
+
+    @cached_property
+    def index_of(self):
+        if "index_of" in self.mapped:
+            return self.mapped["index_of"]
+        index_of = array("i", [0]) * self.cells
+        for i, cell in enumerate(self.order):
+            index_of[cell] = i
+        return index_of
+
+    @cached_property
+    def next_cell(self):
+        if "next_cell" in self.mapped:
+            return self.mapped["next_cell"]
+        order = self.order
+        next_cell = array("i", [0]) * self.cells
+        previous = order[-1]
+        for cell in order:
+            next_cell[previous] = cell
+            previous = cell
+        return next_cell
+
+    @cached_property
+    def wall_distance(self):
+        if "wall_distance" in self.mapped:
+            return self.mapped["wall_distance"]
+        cols, rows = self.cols, self.rows
+        return array("i", (min(x, cols - 1 - x, y, rows - 1 - y) for y in range(rows) for x in range(cols)))
+
+    @cached_property
+    def adjacency(self):
+        if "adjacency" in self.mapped:
+            return self.mapped["adjacency"]
+        cols, cells = self.cols, self.cells
+        adjacency = array("i")
+        for cell in range(cells):
+            x = cell % cols
+            adjacency.extend((cell + 1 if x + 1 < cols else -1, cell - 1 if x > 0 else -1,
+                              cell + cols if cell + cols < cells else -1, cell - cols if cell >= cols else -1))
+        return adjacency
+
+    def write(self, path):
+        # Alle Tabellen in eine Datei schreiben (erst in eine temporäre, dann umbenennen)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp = path + ".tmp"
+        with open(temp, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.cols, self.rows))
+            for name in SECTIONS:
+                section = getattr(self, name)
+                file.write(section.tobytes() if isinstance(section, array) else section)
+        os.replace(temp, path)
+
+
+@lru_cache(maxsize=None)
+def get_tables(cols, rows):
+    # Einmal pro Brettgröße und Prozess; aus TABLES_DIR eingeblendet, falls vorberechnet
+    return Tables(cols, rows, table_path(cols, rows))
+
+
+def parse_size(text):
+    cols, _, rows = text.partition("x")
+    return int(cols), int(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tabellen pro Brettgröße vorberechnen")
+    parser.add_argument("--dir", default=TABLES_DIR, help="Verzeichnis der Tabellendateien")
+    sub = parser.add_subparsers(dest="command", required=True)
+    precompute_parser = sub.add_parser("precompute", help="Tabellen berechnen und schreiben")
+    precompute_parser.add_argument("sizes", nargs="+", type=parse_size, help="Brettgrößen als SPALTENxZEILEN")
+    info_parser = sub.add_parser("info", help="Tabellendatei einblenden und Ladezeit anzeigen")
+    info_parser.add_argument("sizes", nargs="+", type=parse_size)
+    args = parser.parse_args(argv)
+
+    for cols, rows in args.sizes:
+        path = table_path(cols, rows, args.dir)
+        start = time.perf_counter()
+        if args.command == "precompute":
+            Tables(cols, rows).write(path)
+            print(f"{cols}x{rows}: {os.path.getsize(path) / 1024:.0f} KB nach {path} "
+                  f"in {time.perf_counter() - start:.2f} s")
+        else:
+            tables = Tables(cols, rows, path)
+            if tables.path is None:
+                print(f"{cols}x{rows}: keine passende Datei {path}")
+                continue
+            elapsed = time.perf_counter() - start
+            print(f"{cols}x{rows}: {os.path.getsize(path) / 1024:.0f} KB eingeblendet in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# tournament.py
+# Spielt tausende Partien mit festen Seeds parallel (ein Prozess pro Kern) und vergleicht zwei Strategien.
+# Eine Strategie ist eine Funktion(game) wie auto_move, angegeben als "modul:funktion".
+#
+# Aufruf:
+#   python tournament.py --games 2000                                   # nur auto_move
+#   python tournament.py --games 2000 --b mein_modul:auto_move_v2       # A/B-Vergleich
+import argparse
+import importlib
+import json
+import math
+import os
+import time
+from collections import Counter
+from multiprocessing import Pool
+from constants import COLS, ROWS
+from headless import play_game
+
+METRICS = ("score", "coverage", "moves", "moves_per_food")
+
+
+def load_strategy(spec):
+    module_name, _, function_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), function_name or "auto_move")
+
+
+def _play(task):
+    # Läuft im Worker-Prozess; die Strategie wird dort per Name importiert
+    slot, spec, seed, max_moves, cols, rows = task
+    result = play_game(max_moves, seed, load_strategy(spec), cols, rows)
+    result["slot"] = slot
+    result["moves_per_food"] = result["moves"] / result["score"] if result["score"] else float(result["moves"])
+    return result
+
+
+def run_games(specs, seeds, max_moves, workers, cols=COLS, rows=ROWS):
+    # Alle (Strategie, Seed)-Paare über den Pool verteilen; Ergebnisse pro Strategie nach Seed sortiert.
+    # Strategien werden über ihre Position unterschieden, damit auch A gegen A (Rauschtest) geht.
+    tasks = [(slot, spec, seed, max_moves, cols, rows) for seed in seeds for slot, spec in enumerate(specs)]
+    chunksize = max(1, len(tasks) // (workers * 8))
+    results = [[] for _ in specs]
+    with Pool(workers) as pool:
+        for result in pool.imap_unordered(_play, tasks, chunksize):
+            results[result["slot"]].append(result)
+    for games in results:
+        games.sort(key=lambda r: r["seed"])
+    return results
+
+
+def mean_ci(values, z=1.96):
+    # Mittelwert und halbe Breite des ~95%-Konfidenzintervalls (Normalapproximation)
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, float("nan")
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, z * math.sqrt(variance / n)
+
+
+def summarize(games):
+    summary = {"games": len(games)}
+    for metric in METRICS:
+        mean, half_width = mean_ci([g[metric] for g in games])
+        summary[metric] = {"mean": mean, "ci95": half_width}
+    summary["death_causes"] = dict(Counter(g["death_cause"] for g in games).most_common())
+    summary["moves_per_sec"] = sum(g["moves"] for g in games) / sum(g["duration"] for g in games)
+    return summary
+
+
+def compare(games_a, games_b):
+    # Gepaarter Vergleich über gleiche Seeds: Mittelwert der Differenzen B - A mit Konfidenzintervall
+    comparison = {}
+    for metric in METRICS:
+        diffs = [b[metric] - a[metric] for a, b in zip(games_a, games_b)]
+        mean, half_width = mean_ci(diffs)
+        comparison[metric] = {"diff": mean, "ci95": half_width,
+                              "significant": not math.isnan(half_width) and abs(mean) > half_width}
+    return comparison
+
+
+def print_summary(spec, summary):
+    print(f"{spec}: {summary['games']} Partien, {summary['moves_per_sec']:.0f} Züge/s pro Prozess")
+    for metric in METRICS:
+        print(f"  {metric:<15} {summary[metric]['mean']:>10.2f} ± {summary[metric]['ci95']:.2f}")
+    total = summary["games"]
+    causes = ", ".join(f"{cause} {count / total:.1%}" for cause, count in summary["death_causes"].items())
+    print(f"  Spielende: {causes}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallele Partien mit festen Seeds und A/B-Vergleich")
+    parser.add_argument("--games", type=int, default=1000, help="Partien pro Strategie")
+    parser.add_argument("--seed", type=int, default=0, help="Erster Seed; die Partien nutzen seed .. seed+games-1")
+    parser.add_argument("--max-moves", type=int, default=200000)
+    parser.add_argument("--cols", type=int, default=COLS, help="Spalten des Bretts")
+    parser.add_argument("--rows", type=int, default=ROWS, help="Zeilen des Bretts")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Prozesse (Standard: ein Prozess pro Kern)")
+    parser.add_argument("--a", default="auto_move:auto_move", help="Strategie A als modul:funktion")
+    parser.add_argument("--b", default=None, help="Strategie B als modul:funktion (optional)")
+    parser.add_argument("--json", default=None, help="Zusammenfassung und Vergleich als JSON speichern")
+    args = parser.parse_args(argv)
+
+    specs = [args.a] + ([args.b] if args.b else [])
+    seeds = range(args.seed, args.seed + args.games)
+    start = time.perf_counter()
+    results = run_games(specs, seeds, args.max_moves, args.workers, args.cols, args.rows)
+    elapsed = time.perf_counter() - start
+
+    report = {"workers": args.workers, "elapsed": elapsed, "strategies": []}
+    for spec, games in zip(specs, results):
+        summary = summarize(games)
+        summary["strategy"] = spec
+        report["strategies"].append(summary)
+        print_summary(spec, summary)
+    if args.b:
+        report["comparison"] = compare(results[0], results[1])
+        print(f"Vergleich {args.b} - {args.a} (gleiche Seeds):")
+        for metric, values in report["comparison"].items():
+            marker = " *" if values["significant"] else ""
+            print(f"  {metric:<15} {values['diff']:>+10.2f} ± {values['ci95']:.2f}{marker}")
+    total_games = args.games * len(specs)
+    print(f"{total_games} Partien in {elapsed:.1f} s mit {args.workers} Prozessen ({total_games / elapsed:.1f} Partien/s)")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
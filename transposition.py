@@ -0,0 +1,103 @@
+# transposition.py
+# Begrenzter LRU-Cache für Entscheidungen von auto_move, indiziert über Zobrist-Schlüssel des Spielzustands.
+# Board.zobrist wird pro Zug nur um Kopf und Schwanz nachgeführt; key() faltet Kopf, Schwanz und Futter dazu.
+#
+# Gespeichert werden nur als sicher geprüfte A*-Pfade zum Futter. Vor der Wiederverwendung wird geprüft, ob der Pfad
+# auf dem aktuellen Brett noch begehbar ist, denn gleiche Belegung heißt nicht gleiche Körperreihenfolge.
+# Nach einem Zug entlang des Pfades liegt der Rest schon unter dem Schlüssel des Folgezustands.
+# Jeder Eintrag merkt sich den Stand (Board.pushes), für den er geprüft ist; nur dort braucht auto_move die
+# Sicherheitsprüfung nicht zu wiederholen. Treffer und Fehlschläge zählt stats().
+# Flächen und count_reachable werden nicht gemerkt: die Zustände wiederholen sich innerhalb einer Partie kaum.
+from collections import OrderedDict
+from board import ZOBRIST_HEAD, ZOBRIST_TAIL, ZOBRIST_FOOD
+
+DEFAULT_SIZE = 4096
+
+
+class LRUCache:
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def _role_key(board, role, pos):
+    return board.keys[role * board.cols * board.rows + board.index(pos)]
+
+
+def key(board, food=None):
+    # Zustandsschlüssel: Belegung, Kopf, Schwanz und (optional) Futter
+    k = board.zobrist ^ _role_key(board, ZOBRIST_HEAD, board[0]) ^ _role_key(board, ZOBRIST_TAIL, board[-1])
+    if food is not None:
+        k ^= _role_key(board, ZOBRIST_FOOD, food)
+    return k
+
+
+def key_after_move(board, new_head, food):
+    # Schlüssel nach einem Zug auf new_head ohne zu fressen, ohne das Brett anzufassen
+    new_tail = board[-2] if len(board) > 1 else new_head
+    return (board.zobrist ^ board.keys[board.index(new_head)] ^ board.keys[board.index(board[-1])]
+            ^ _role_key(board, ZOBRIST_HEAD, new_head) ^ _role_key(board, ZOBRIST_TAIL, new_tail)
+            ^ _role_key(board, ZOBRIST_FOOD, food))
+
+
+def path_is_valid(board, path, food):
+    # Pfad beginnt am Kopf, endet am Futter und jedes Feld ist bei Ankunft frei (wie a_star mit time_aware)
+    if path[0] != board[0] or path[-1] != food:
+        return False
+    for step in range(1, len(path)):
+        pos = path[step]
+        if not board.in_bounds(pos):
+            return False
+        if board.free_after(board.index(pos)) > step:
+            return False
+    return True
+
+
+class DecisionCache:
+    # Als sicher geprüfte Pfade zum Futter, mit Treffer- und Fehlschlagzähler
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        self.paths = LRUCache(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, board, food):
+        # Gültigen gespeicherten Pfad zum Futter als (pfad, geprüft) liefern, sonst (None, False).
+        # Gleicher Schlüssel bei anderer Körperreihenfolge kann einen nicht mehr begehbaren Pfad liefern; das
+        # zählt als Fehlschlag. geprüft ist der Pfad nur für genau den Stand, für den er gespeichert wurde.
+        entry = self.paths.get(key(board, food))
+        if entry is not None:
+            path, checked_at = entry
+            if path_is_valid(board, path, food):
+                self.hits += 1
+                return path, checked_at == board.pushes
+        self.misses += 1
+        return None, False
+
+    def store_path(self, board, food, path):
+        # path muss für den aktuellen Stand als sicher geprüft sein
+        self.paths.put(key(board, food), (path, board.pushes))
+        if len(path) > 2:
+            # Der Rest des Pfades ist nach dem ersten Schritt wieder ein kürzester Weg zum Futter, und die
+            # virtuelle Schlange endet dort auf demselben Körper: für den Folgezustand gilt die Prüfung weiter
+            self.paths.put(key_after_move(board, path[1], food), (path[1:], board.pushes + 1))
+
+    def stats(self):
+        # {"hits", "misses", "hit_rate", "size"}
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self.paths)}